@@ -1,4 +1,6 @@
 from app import app
 
 if __name__ == '__main__':
+    from app.controller.JobController import recover_jobs
+    recover_jobs()
     app.run(debug=True)
\ No newline at end of file
@@ -2,105 +2,176 @@ import os
 import uuid
 import time
 import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import dlib
 import cv2
-import joblib
 import pandas as pd
 import numpy as np
-from flask import url_for
+from flask import request, url_for, send_file
 from werkzeug.utils import secure_filename
 from app import response, app
 from app.request.DataModel.DataTestStoreRequest import DataTestStoreRequest
-from app.helper.preprocessing import get_frames_by_input_video, extract_component_by_images, draw_quiver_and_save_plotlib_image, convert_video_to_webm
-from app.helper.helper import convert_video_to_avi, natural_sort_key, get_calculate_from_predict, convert_ndarray_to_list
-from app.helper.poc import POC
-from app.helper.vektor import Vektor
-from app.helper.quadran import Quadran
-from app.helper.constant import COMPONENTS_SETUP, FRAMES_DATA_QUADRAN_COMPONENTS, MODEL_PREDICTOR, MODEL_SVM_EXTRACTION_FEATURE , QUADRAN_DIMENSIONS, BLOCKSIZE
+from app.helper.preprocessing import get_frames_stream_by_input_video, get_sampled_frame_count, extract_component_by_images, get_component_rectangle, draw_quiver_and_save_image, convert_video_to_webm
+from app.helper.helper import get_calculate_from_predict, convert_ndarray_to_list
+from app.helper.poc import POCSpectrum
+from app.helper.schema import FeatureMatrices, get_feature_schema
+from app.helper.cache import ResultCache, get_file_fingerprints
+from app.helper.export import save_feature_matrices, has_feature_matrices, parse_export_filename, convert_feature_table
+from app.helper.preview import PreviewRecorder, load_preview_manifest, get_component_by_object_name, read_video_frame, crop_component
+from app.helper.face import FaceTracker
+from app.helper.models import ModelRegistry, load_joblib
+from app.helper.svm import build_fast_svm
+from app.helper.transforms import TransformGraph
+from app.helper.extraction import compute_component_features, write_component_features, extract_features_chunk, get_extraction_pool
+from app.helper.constant import COMPONENTS_SETUP, MODEL_PREDICTOR, MODEL_SVM_EXTRACTION_FEATURE , BLOCKSIZE, BROWSER_PLAYABLE_VIDEO_EXTENSIONS
 
 # ==============================================================================
-# GLOBAL MODEL AND CONFIGURATION LOADING
+# MODEL REGISTRY
 # ==============================================================================
-# Load all models once when the application starts to improve performance.
-# This avoids reloading heavy models on every API request.
+# Models are loaded on first use instead of at import time (memory-mapped
+# where the joblib file allows it) and reloaded when their file under
+# assets/models changes. See app/helper/models.py.
 # ==============================================================================
 
-try:
-    # --- Dlib Model Loading ---
-    DLIB_DETECTOR = dlib.get_frontal_face_detector()
-    DLIB_PREDICTOR_PATH = os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_MODEL'], MODEL_PREDICTOR)
-    DLIB_PREDICTOR = dlib.shape_predictor(DLIB_PREDICTOR_PATH)
-    print("[INFO] Dlib models loaded successfully.")
-
-    # --- Base Paths ---
-    BASE_MODEL_PATH = os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_MODEL'])
-
-    # --- Helper Function for Safe Loading ---
-    def _load_joblib(filename):
-        path = os.path.join(BASE_MODEL_PATH, filename)
-        if not os.path.exists(path):
-            print(f"[ERROR] Model file not found: {path}")
-            return None
-        return joblib.load(path)
-
-    # --- Feature Info & PCA ---
-    HYBRID_FEATURE_INFO = _load_joblib('hybrid_feature_selection_info.joblib')
-    PCA_MODEL = _load_joblib('pca_100comp.joblib')
-
-    # --- Scalers ---
-    SCALERS = {
-        'default': _load_joblib('scaler.joblib'),
-        '4qmv': _load_joblib('4qmv_scaler.joblib'),
-        'lda': _load_joblib('scaler_lda.joblib'),
-        'hybrid': _load_joblib('hybrid_scaler.joblib'),
-    }
-
-    # --- Pre-trained Models & Encoders ---
-    # Grouping models, scalers, and encoders together for easier management
-    GLOBAL_MODELS = {
-        "random_sampling": {
-            "fitur_all_component": {
-                "model": _load_joblib('svm_model_rbf.joblib'),
-                "scaler": SCALERS['default'],
-                "label_encoder": _load_joblib('label_encoder.joblib'),
-                "except_features": ['Frame', 'Folder Path', 'Label']
-            },
-            "fitur_pca_component": {
-                "model": _load_joblib('svm_model_rbf_pca.joblib'),
-                "scaler": None, # PCA data is already scaled
-                "label_encoder": _load_joblib('label_encoder_pca.joblib'),
-                "except_features": []
-            },
-            "4qmv_all_component": {
-                "model": _load_joblib('4qmv_svm_model_rbf.joblib'),
-                "scaler": SCALERS['4qmv'],
-                "label_encoder": _load_joblib('4qmv_label_encoder.joblib'),
-                "except_features": ['Frame', 'Folder Path', 'Label']
-            },
-            "full_model_lda": {
-                "model": _load_joblib('svm_full_model_lda.joblib'),
-                "scaler": SCALERS['lda'],
-                "label_encoder": _load_joblib('label_encoder_lda.joblib'),
-                "except_features": ['Frame', 'Folder Path', 'Label']
-            },
-        }
-    }
-
-    # --- Hybrid Model Pre-processors (if any) ---
-    HYBRID_PREFILTER = None
-    HYBRID_RFE = None
-    if HYBRID_FEATURE_INFO and HYBRID_FEATURE_INFO['method'] != 'direct_from_exploration':
-        HYBRID_PREFILTER = _load_joblib('hybrid_prefilter.joblib')
-        HYBRID_RFE = _load_joblib('hybrid_rfe.joblib')
+BASE_MODEL_PATH = os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_MODEL'])
+DLIB_PREDICTOR_PATH = os.path.join(BASE_MODEL_PATH, MODEL_PREDICTOR)
+
+MODEL_REGISTRY = ModelRegistry(
+    BASE_MODEL_PATH,
+    mmapMode=app.config['MODEL_MMAP_MODE'],
+    checkInterval=app.config['MODEL_RELOAD_CHECK_INTERVAL']
+)
+
+# --- Dlib Models ---
+MODEL_REGISTRY.register('dlib_detector', loader=lambda path, mmapMode: dlib.get_frontal_face_detector())
+MODEL_REGISTRY.register('dlib_predictor', MODEL_PREDICTOR, loader=lambda path, mmapMode: dlib.shape_predictor(path))
+
+# --- Feature Info & PCA ---
+MODEL_REGISTRY.register('hybrid_feature_info', 'hybrid_feature_selection_info.joblib')
+MODEL_REGISTRY.register('pca', 'pca_100comp.joblib')
+
+# --- Scalers ---
+MODEL_REGISTRY.register('scaler_default', 'scaler.joblib')
+MODEL_REGISTRY.register('scaler_4qmv', '4qmv_scaler.joblib')
+MODEL_REGISTRY.register('scaler_lda', 'scaler_lda.joblib')
+MODEL_REGISTRY.register('scaler_hybrid', 'hybrid_scaler.joblib')
+
+# --- Hybrid Model Pre-processors (only used by some selection methods) ---
+MODEL_REGISTRY.register('hybrid_prefilter', 'hybrid_prefilter.joblib', optional=True)
+MODEL_REGISTRY.register('hybrid_rfe', 'hybrid_rfe.joblib', optional=True)
+
+# --- Pre-trained Models & Encoders ---
+def _load_svm_model(path, mmapMode):
+    # RBF SVCs are wrapped with the batched NumPy scorer once it matches model.predict
+    model = load_joblib(path, mmapMode)
+    if app.config['SVM_SCORING_ENGINE'] != 'numpy':
+        return model
+    return build_fast_svm(model, dtype=app.config['SVM_SCORING_DTYPE'], name=os.path.basename(path))
+
+MODEL_REGISTRY.register('svm_rbf', 'svm_model_rbf.joblib', loader=_load_svm_model)
+MODEL_REGISTRY.register('svm_rbf_pca', 'svm_model_rbf_pca.joblib', loader=_load_svm_model)
+MODEL_REGISTRY.register('svm_rbf_4qmv', '4qmv_svm_model_rbf.joblib', loader=_load_svm_model)
+MODEL_REGISTRY.register('svm_full_lda', 'svm_full_model_lda.joblib', loader=_load_svm_model)
+MODEL_REGISTRY.register('label_encoder', 'label_encoder.joblib')
+MODEL_REGISTRY.register('label_encoder_pca', 'label_encoder_pca.joblib')
+MODEL_REGISTRY.register('label_encoder_4qmv', '4qmv_label_encoder.joblib')
+MODEL_REGISTRY.register('label_encoder_lda', 'label_encoder_lda.joblib')
 
-    print("[INFO] All ML models, scalers, and encoders loaded globally.")
+# ==============================================================================
+# FEATURE TRANSFORMS
+# ==============================================================================
+# Preprocessing as a graph of named transforms over the two raw feature
+# matrices. Every node is computed at most once per request and shared by all
+# models that read it (e.g. 'scaled_default' feeds both the full-feature SVM
+# and PCA). See app/helper/transforms.py.
+# ==============================================================================
 
-except Exception as e:
-    print(f"[FATAL ERROR] Failed to load global models: {e}")
-    # You might want to halt the application or handle this more gracefully
-    DLIB_DETECTOR = None
-    DLIB_PREDICTOR = None
-    GLOBAL_MODELS = {}
+def _get_artifact(name):
+    artifact = MODEL_REGISTRY.get(name)
+    if artifact is None:
+        raise ValueError(f"Model '{name}' is not available.")
+    return artifact
+
+def _select_hybrid_features(df_scaled_hybrid, df_for_all):
+    hybrid_feature_info = _get_artifact('hybrid_feature_info')
+
+    if hybrid_feature_info['method'] == 'direct_from_exploration':
+        selected_features = hybrid_feature_info['selected_features']
+        return pd.DataFrame(df_scaled_hybrid, columns=df_for_all.columns)[selected_features]
+
+    if MODEL_REGISTRY.get('hybrid_prefilter') and MODEL_REGISTRY.get('hybrid_rfe'):
+        df_prefiltered = MODEL_REGISTRY.get('hybrid_prefilter').transform(df_scaled_hybrid)
+        return pd.DataFrame(MODEL_REGISTRY.get('hybrid_rfe').transform(df_prefiltered))
+
+    raise ValueError("Hybrid feature preprocessors not found.")
+
+FEATURE_GRAPH = TransformGraph()
+# --- Sources: raw feature-only DataFrames (no Frame/Folder Path/Label columns) ---
+FEATURE_GRAPH.addSource('fitur_all')
+FEATURE_GRAPH.addSource('4qmv_all')
+
+# --- Scaling ---
+FEATURE_GRAPH.add('scaled_default', ['fitur_all'], lambda data: _get_artifact('scaler_default').transform(data))
+FEATURE_GRAPH.add('scaled_4qmv', ['4qmv_all'], lambda data: _get_artifact('scaler_4qmv').transform(data))
+FEATURE_GRAPH.add('scaled_lda', ['fitur_all'], lambda data: _get_artifact('scaler_lda').transform(data))
+FEATURE_GRAPH.add('scaled_hybrid', ['fitur_all'], lambda data: _get_artifact('scaler_hybrid').transform(data))
+
+# --- PCA & Hybrid Feature Selection ---
+FEATURE_GRAPH.add('pca', ['scaled_default'], lambda data: pd.DataFrame(_get_artifact('pca').transform(data)))
+FEATURE_GRAPH.add('hybrid', ['scaled_hybrid', 'fitur_all'], _select_hybrid_features)
+
+# Grouping models, their input transform node, and encoders together (by registry name) for easier management
+MODEL_GROUPS = {
+    "random_sampling": {
+        "fitur_all_component": {
+            "model": 'svm_rbf',
+            "features": 'scaled_default',
+            "label_encoder": 'label_encoder',
+        },
+        "fitur_pca_component": {
+            "model": 'svm_rbf_pca',
+            "features": 'pca',
+            "label_encoder": 'label_encoder_pca',
+        },
+        "4qmv_all_component": {
+            "model": 'svm_rbf_4qmv',
+            "features": 'scaled_4qmv',
+            "label_encoder": 'label_encoder_4qmv',
+        },
+        "full_model_lda": {
+            "model": 'svm_full_lda',
+            "features": 'scaled_lda',
+            "label_encoder": 'label_encoder_lda',
+        },
+    }
+}
+
+# Independent models are predicted concurrently (kernel evaluations release the GIL)
+PREDICTION_EXECUTOR = ThreadPoolExecutor(
+    max_workers=app.config['PREDICTION_WORKERS'],
+    thread_name_prefix='prediction-worker'
+) if app.config['PREDICTION_WORKERS'] > 1 else None
+
+if app.config['MODEL_PRELOAD']:
+    MODEL_REGISTRY.loadAll()
+    print("[INFO] All ML models, scalers, and encoders preloaded.")
+
+# --- Result Cache ---
+# Re-uploads of the same clip with the same pipeline configuration return the stored response.
+RESULT_CACHE = ResultCache(
+    os.path.join(app.config['UPLOAD_FOLDER'], app.config['RESULT_CACHE_FOLDER']),
+    maxBytes=app.config['RESULT_CACHE_MAX_BYTES'],
+    maxAge=app.config['RESULT_CACHE_MAX_AGE'],
+    # Every analysis output under assets/ counts toward the size limit, cached or not
+    outputDirectories=[
+        os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_VIDEO']),
+        os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_VIDEO'], 'playable'),
+        os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_DATA']),
+        os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_IMAGE'], 'output'),
+    ],
+    evictInterval=app.config['RESULT_CACHE_EVICT_INTERVAL']
+) if app.config['RESULT_CACHE_ENABLED'] else None
 
 
 # ==============================================================================
@@ -110,8 +181,8 @@ except Exception as e:
 def store():
     """
     Handles the main API request for video-based feature extraction and prediction.
-    Orchestrates the pipeline: video processing, feature extraction,
-    prediction, and response formatting.
+    Validates and saves the upload, then runs the whole pipeline synchronously
+    (see process_video). For long clips prefer the job API in JobController.
     """
     print("[START] New prediction request received.")
 
@@ -124,54 +195,12 @@ def store():
     new_filename_base = f'video-{str(uuid.uuid4())}'
 
     try:
-        # --- 1. Video Processing ---
-        video_paths, images_list, error = _handle_video_processing(file, new_filename_base)
+        file_path_video = save_uploaded_video(file, new_filename_base)
+
+        response_data, error = process_video(file_path_video, new_filename_base, with_preview)
         if error:
             return response.error(message=error)
 
-        (
-            file_path_video,
-            file_path_output_images,
-            new_filename_with_extension,
-            file_path_video_response
-        ) = video_paths
-
-        # --- 2. Feature Extraction ---
-        print(f"[INFO] Extracting features from frames in: {file_path_output_images}")
-        df_fitur_all, df_quadran, preview_data_list = _extract_features_from_frames(
-            file_path_output_images,
-            images_list,
-            with_preview
-        )
-
-        if df_fitur_all.empty or df_quadran.empty:
-            return response.error(message="No faces detected or features extracted.")
-
-        # --- 3. Save Features to CSV/Excel ---
-        csv_urls = _save_feature_dataframes(df_fitur_all, df_quadran, new_filename_base)
-
-        # --- 4. Prepare Feature Sets for Prediction ---
-        print("[INFO] Preparing feature sets (PCA, Hybrid, etc.).")
-        feature_sets = _prepare_feature_sets(
-            df_fitur_all,
-            df_quadran,
-            except_columns=['Frame', 'Folder Path', 'Label']
-        )
-
-        # --- 5. Run All Predictions ---
-        print("[INFO] Running predictions on all models.")
-        predictions_result_all = _run_all_predictions(feature_sets)
-
-        # --- 6. Format API Response ---
-        print("[INFO] Formatting final API response.")
-        response_data = _format_api_response(
-            video_info=(file_path_video_response, new_filename_with_extension),
-            csv_urls=csv_urls,
-            predictions_result_all=predictions_result_all,
-            preview_data_list=preview_data_list,
-            with_preview=with_preview
-        )
-
         print("[SUCCESS] Processing finished.\n")
         return response.success(200, 'Ok', response_data)
 
@@ -181,275 +210,585 @@ def store():
         traceback.print_exc()
         return response.error(500, message=f"An internal server error occurred: {e}")
 
+def save_uploaded_video(file, new_filename_base):
+    """
+    Saves the uploaded video as-is under the videos upload folder
+    (OpenCV decodes mp4/mkv/mov/webm/avi directly, no transcode needed).
+    Returns the saved file path.
+    """
+    file_extension = secure_filename(file.filename).split('.')[-1].lower()
+    file_path_video = os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_VIDEO'], f"{new_filename_base}.{file_extension}")
+
+    file.save(file_path_video)
+
+    return file_path_video
+
+def process_video(file_path_video, new_filename_base, with_preview, progress=None):
+    """
+    Orchestrates the pipeline on a saved video: video processing, feature
+    extraction, export, prediction, and response formatting.
+    Needs a request context for URL building (jobs push one themselves).
+    If given, progress(event, data) is called on stage transitions ('stage'),
+    processed frames ('frames') and each finished model ('prediction').
+    Returns (response_data, None) or (None, error_message).
+    """
+    # --- 0. Result Cache ---
+    cache_key = None
+    if RESULT_CACHE is not None:
+        cache_key = RESULT_CACHE.getKey(file_path_video, _get_pipeline_fingerprint(with_preview))
+        cached_response = RESULT_CACHE.get(cache_key, request.url_root)
+        if cached_response is not None:
+            print(f"[INFO] Cache hit for {os.path.basename(file_path_video)}, returning stored result.")
+            # The stored result points at the assets of the first upload
+            os.remove(file_path_video)
+            _report(progress, 'stage', stage='cached')
+            return cached_response, None
+
+    # --- 1. Video Processing ---
+    _report(progress, 'stage', stage='video_processing')
+    video_paths, frames, error = _handle_video_processing(file_path_video, new_filename_base)
+    if error:
+        return None, error
+
+    (
+        file_path_video,
+        file_path_output_images,
+        new_filename_with_extension,
+        file_path_video_response
+    ) = video_paths
+
+    # --- 2. Feature Extraction ---
+    if None in get_face_models():
+        return None, "Face detection models are not available."
+
+    print(f"[INFO] Extracting features from frames of: {new_filename_with_extension}")
+    total_frames = get_sampled_frame_count(
+        file_path_video,
+        targetFps=app.config['FRAME_SAMPLING_TARGET_FPS'],
+        stride=app.config['FRAME_SAMPLING_STRIDE'],
+        maxFrames=app.config['FRAME_SAMPLING_MAX_FRAMES']
+    )
+    _report(progress, 'stage', stage='feature_extraction', total_frames=total_frames)
+    preview_recorder = PreviewRecorder(get_feature_schema().blockCounts) if with_preview else None
+    features, preview_data_list = _extract_features_from_frames(
+        frames,
+        file_path_output_images,
+        preview_recorder,
+        progress=lambda processed: _report(progress, 'frames', processed=processed, total=total_frames)
+    )
+
+    # Preview images are only drawn when their URL is opened (see show_preview_image)
+    if with_preview:
+        preview_recorder.save(file_path_output_images, file_path_video)
+
+    if features.isEmpty():
+        return None, "No faces detected or features extracted."
+
+    # --- 3. Save Features (CSV/Excel are converted on download) ---
+    _report(progress, 'stage', stage='export')
+    csv_urls = _save_feature_matrices(features, new_filename_base)
+
+    # --- 4. Prepare Feature Sets for Prediction ---
+    print("[INFO] Preparing feature sets (PCA, Hybrid, etc.).")
+    _report(progress, 'stage', stage='feature_preparation')
+    feature_sets = _prepare_feature_sets(*features.getFeatureDataFrames())
+
+    # --- 5. Run All Predictions ---
+    print("[INFO] Running predictions on all models.")
+    _report(progress, 'stage', stage='prediction')
+    prediction_start_time = time.time()
+    predictions_result_all = _run_all_predictions(feature_sets, progress=progress)
+    prediction_time = round(time.time() - prediction_start_time, 4)
+    transform_times = feature_sets.getTimings()
+    print(f"[INFO] Predictions finished in {prediction_time}s. Feature transform times: {transform_times}")
+
+    # --- 6. Format API Response ---
+    print("[INFO] Formatting final API response.")
+    _report(progress, 'stage', stage='formatting')
+    response_data = _format_api_response(
+        video_info=(file_path_video_response, new_filename_with_extension),
+        csv_urls=csv_urls,
+        predictions_result_all=predictions_result_all,
+        preview_data_list=preview_data_list,
+        with_preview=with_preview
+    )
+    response_data["transform_times"] = transform_times
+    response_data["testing_time_total_seconds"] = prediction_time
+
+    if RESULT_CACHE is not None:
+        _store_cached_result(cache_key, response_data, file_path_video, file_path_output_images, new_filename_base, with_preview)
+
+    return response_data, None
+
+def predict_features(features):
+    """
+    Runs every loaded model on the rows of a FeatureMatrices.
+    Used by the streaming endpoint for small batches of frames.
+    Returns the same nested {train_key: {metode_key: result}} as the batch pipeline.
+    """
+    feature_sets = _prepare_feature_sets(*features.getFeatureDataFrames())
+    return _run_all_predictions(feature_sets)
+
+def get_face_models():
+    """
+    Returns the dlib (detector, predictor) pair from the model registry.
+    The predictor is None if its file is missing.
+    """
+    return MODEL_REGISTRY.get('dlib_detector'), MODEL_REGISTRY.get('dlib_predictor')
+
+def show_models():
+    """
+    Reports every registered model artifact: whether it is loaded, load time,
+    memory (in-memory and memory-mapped array bytes) and reload count.
+    With ?load=true all artifacts are loaded first.
+    """
+    if request.args.get('load', 'false').lower() == 'true':
+        MODEL_REGISTRY.loadAll()
+
+    return response.success(200, 'Ok', MODEL_REGISTRY.report())
+
+def show_playable_video(video_name):
+    """
+    Serves a browser-playable (webm) copy of an uploaded video.
+    The copy is transcoded lazily on the first request and reused afterwards,
+    so feature extraction never waits on it.
+    """
+    video_name = secure_filename(video_name)
+    video_dir = os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_VIDEO'])
+    file_path_playable = os.path.join(video_dir, 'playable', f"{video_name}.webm")
+
+    if not os.path.exists(file_path_playable):
+        source_filename = next((
+            filename for filename in os.listdir(video_dir)
+            if os.path.splitext(filename)[0] == video_name and os.path.isfile(os.path.join(video_dir, filename))
+        ), None)
+        if source_filename is None:
+            return response.error(404, "Video not found")
+
+        with _get_file_lock(file_path_playable):
+            # Another request may have finished the transcode while we waited
+            if not os.path.exists(file_path_playable):
+                print(f"[INFO] Transcoding {source_filename} to a playable webm copy...")
+                os.makedirs(os.path.dirname(file_path_playable), exist_ok=True)
+                file_path_tmp = os.path.join(os.path.dirname(file_path_playable), f"{video_name}.tmp.webm")
+                convert_video_to_webm(os.path.join(video_dir, source_filename), file_path_tmp)
+                os.replace(file_path_tmp, file_path_playable)
+
+    return send_file(os.path.abspath(file_path_playable), mimetype='video/webm')
+
+def show_feature_export(video_name, filename):
+    """
+    Serves a feature table as CSV or XLSX. The file is converted from the
+    stored feature matrices on the first download and reused afterwards.
+    """
+    video_name = secure_filename(video_name)
+    export = parse_export_filename(filename)
+    output_csv_dir = os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_DATA'], video_name)
+    file_path_export = os.path.join(output_csv_dir, filename)
+
+    if export is None:
+        return response.error(404, "Export not found")
+
+    if not os.path.exists(file_path_export):
+        if not has_feature_matrices(output_csv_dir):
+            return response.error(404, "Export not found")
+
+        with _get_file_lock(file_path_export):
+            # Another request may have finished the conversion while we waited
+            if not os.path.exists(file_path_export):
+                print(f"[INFO] Converting features of {video_name} to {filename}...")
+                convert_feature_table(output_csv_dir, *export)
+
+    return send_file(os.path.abspath(file_path_export), as_attachment=True, download_name=filename)
+
+def show_preview_image(video_name, filename):
+    """
+    Serves one preview image of a video processed with with_preview: the
+    full frame ('img3.jpg'), a component crop ('mouth/img3.jpg') or its
+    quiver plot ('mouth/img3-quiver.jpg').
+    Images are drawn from the stored preview data on the first request and
+    cached under the same layout in the images output folder.
+    """
+    video_name = secure_filename(video_name)
+    frames_dir = os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_IMAGE'], 'output', video_name)
+    file_path_image = os.path.normpath(os.path.join(frames_dir, filename))
+
+    if not file_path_image.startswith(os.path.normpath(frames_dir) + os.sep) or not file_path_image.endswith('.jpg'):
+        return response.error(404, "Preview not found")
+
+    if not os.path.exists(file_path_image):
+        manifest = load_preview_manifest(frames_dir)
+        if manifest is None:
+            return response.error(404, "Preview not found")
+
+        with _get_file_lock(file_path_image):
+            # Another request may have drawn it while we waited
+            if not os.path.exists(file_path_image) and not _render_preview_image(manifest, frames_dir, filename):
+                return response.error(404, "Preview not found")
+
+    return send_file(os.path.abspath(file_path_image), mimetype='image/jpeg')
+
 # ==============================================================================
 # HELPER FUNCTIONS (Private)
 # ==============================================================================
 
-def _handle_video_processing(file, new_filename_base):
+def _report(progress, event, **data):
     """
-    Saves the uploaded video, converts it to AVI if needed,
-    and extracts all frames using a helper.
-    Returns paths and frame info.
+    Forwards a pipeline event to the progress callback, if any.
     """
-    file_extension = secure_filename(file.filename).split('.')[-1].lower()
-    new_filename_with_extension = f"{new_filename_base}.{file_extension}"
+    if progress is not None:
+        progress(event, data)
 
-    file_path_video = os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_VIDEO'], new_filename_with_extension)
-    file_path_output_images = os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_IMAGE'], 'output', new_filename_base)
+_FILE_LOCKS = {}
+_FILE_LOCKS_GUARD = threading.Lock()
 
-    file.save(file_path_video)
+def _get_file_lock(file_path):
+    """
+    Returns the lock that serializes generating a single lazily created file
+    (playable video copy or preview image).
+    """
+    with _FILE_LOCKS_GUARD:
+        return _FILE_LOCKS.setdefault(file_path, threading.Lock())
 
-    if file_extension != 'avi':
-        print(f"[INFO] Converting .{file_extension} video to .avi...")
-        converted_avi_filename = f"{new_filename_base}.avi"
-        converted_avi_file_path = os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_VIDEO'], converted_avi_filename)
+def _render_preview_image(manifest, frames_dir, filename):
+    """
+    Draws one preview image from the stored frame index, ROI coordinates and
+    motion vectors, and writes it to its cache path.
+    Returns False if the frame, face or vectors for it do not exist.
+    """
+    parts = filename.replace('\\', '/').split('/')
+    stem = os.path.splitext(parts[-1])[0]
+    is_quiver = stem.endswith('-quiver')
+    frame_name = stem[:-len('-quiver')] if is_quiver else stem
+
+    frame_names = list(manifest['frames'])
+    if frame_name not in frame_names or len(parts) > 2 or (is_quiver and len(parts) == 1):
+        return False
+    frame_index = frame_names.index(frame_name)
+
+    component_name = None
+    if len(parts) == 2:
+        component_name = get_component_by_object_name(parts[0])
+        if component_name is None or manifest[f'{component_name}_rects'][frame_index][0] < 0:
+            return False
+
+    if is_quiver:
+        vectors = manifest[f'{component_name}_vectors'][frame_index]
+        if np.isnan(vectors).all():
+            return False # Reference frame has no motion vectors
+
+    image = read_video_frame(str(manifest['video']), frame_name)
+    if image is None:
+        return False
+
+    file_path_image = os.path.join(frames_dir, filename)
+    os.makedirs(os.path.dirname(file_path_image), exist_ok=True)
+
+    if component_name is not None:
+        image = crop_component(image, manifest[f'{component_name}_rects'][frame_index])
+
+    if is_quiver:
+        # Drawn under a temporary frame name, then moved into place
+        tmp_frame_name = f"{frame_name}.tmp"
+        draw_quiver_and_save_image(image, np.nan_to_num(vectors), tmp_frame_name, parts[0], frames_dir)
+        os.replace(os.path.join(frames_dir, parts[0], f"{tmp_frame_name}-quiver.jpg"), file_path_image)
+    else:
+        file_path_tmp = f"{os.path.splitext(file_path_image)[0]}.tmp.jpg"
+        cv2.imwrite(file_path_tmp, image)
+        os.replace(file_path_tmp, file_path_image)
+
+    return True
+
+def _get_preview_url(frames_dir, filename):
+    """
+    URL of a lazily rendered preview image (see show_preview_image).
+    """
+    return url_for('preview_image', video_name=os.path.basename(frames_dir), filename=filename, _external=True)
 
-        convert_video_to_avi(file_path_video, converted_avi_file_path)
-        os.remove(file_path_video) # Clean up original
 
-        file_path_video = converted_avi_file_path
-        new_filename_with_extension = converted_avi_filename
+def _get_pipeline_fingerprint(with_preview):
+    """
+    Everything besides the video bytes that changes the result: block size,
+    components, frame sampling, face detection and the model files.
+    """
+    return {
+        "blocksize": BLOCKSIZE,
+        "components": COMPONENTS_SETUP,
+        "frame_sampling": [
+            app.config['FRAME_SAMPLING_TARGET_FPS'],
+            app.config['FRAME_SAMPLING_STRIDE'],
+            app.config['FRAME_SAMPLING_MAX_FRAMES'],
+        ],
+        "face_detection": _get_tracker_options(),
+        "models": get_file_fingerprints(os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_MODEL'])),
+        "svm_scoring": [app.config['SVM_SCORING_ENGINE'], app.config['SVM_SCORING_DTYPE']],
+        "with_preview": bool(with_preview),
+    }
 
-    with app.app_context():
-        file_path_video_response = url_for('static', filename=file_path_video.replace('\\', '/').replace('assets/', '', 1), _external=True)
+def _store_cached_result(cache_key, response_data, file_path_video, file_path_output_images, new_filename_base, with_preview):
+    """
+    Stores a fresh result together with the assets it refers to. The size/age
+    limits are applied in the background once due (see ResultCache.maybeEvict).
+    """
+    required_paths = [
+        file_path_video,
+        os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_DATA'], new_filename_base),
+    ]
+    optional_paths = [
+        os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_VIDEO'], 'playable', f"{new_filename_base}.webm"),
+    ]
+    if with_preview:
+        required_paths.append(file_path_output_images)
+    else:
+        optional_paths.append(file_path_output_images)
 
-    print(f"[INFO] Extracting frames (up to 200) from {new_filename_with_extension}...")
-    images_list, error = get_frames_by_input_video(file_path_video, file_path_output_images, 200)
+    try:
+        RESULT_CACHE.put(cache_key, response_data, request.url_root, required_paths, optional_paths)
+        RESULT_CACHE.maybeEvict()
+    except Exception as e:
+        # Caching must never fail the request itself
+        print(f"[WARN] Could not cache result: {e}")
+
+
+def _handle_video_processing(file_path_video, new_filename_base):
+    """
+    Builds the public URL of a saved video and opens a frame stream over it
+    using a helper.
+    Returns paths and the frame generator.
+    """
+    new_filename_with_extension = os.path.basename(file_path_video)
+    file_extension = new_filename_with_extension.split('.')[-1].lower()
+    file_path_output_images = os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_IMAGE'], 'output', new_filename_base)
+
+    # Browser-playable uploads are served directly; other containers get a
+    # URL that transcodes to webm on first request (see show_playable_video).
+    with app.app_context():
+        if file_extension in BROWSER_PLAYABLE_VIDEO_EXTENSIONS:
+            file_path_video_response = url_for('static', filename=file_path_video.replace('\\', '/').replace('assets/', '', 1), _external=True)
+        else:
+            file_path_video_response = url_for('playable_video', video_name=new_filename_base, _external=True)
+
+    print(f"[INFO] Opening frame stream (up to {app.config['FRAME_SAMPLING_MAX_FRAMES'] or 'all'} frames) from {new_filename_with_extension}...")
+    frames, error = get_frames_stream_by_input_video(
+        file_path_video,
+        targetFps=app.config['FRAME_SAMPLING_TARGET_FPS'],
+        stride=app.config['FRAME_SAMPLING_STRIDE'],
+        maxFrames=app.config['FRAME_SAMPLING_MAX_FRAMES']
+    )
     if error:
         return None, None, error
 
     video_paths = (file_path_video, file_path_output_images, new_filename_with_extension, file_path_video_response)
 
-    return video_paths, images_list, None
+    return video_paths, frames, None
 
 
-def _extract_features_from_frames(frames_dir, images_list, with_preview):
+def _extract_features_from_frames(frames, frames_dir, preview_recorder=None, progress=None):
     """
-    The core logic. Iterates through saved frames, detects faces,
-    calculates POC, Vektor, and Quadran features.
-    Separates preview data generation from feature calculation.
+    The core logic. Consumes decoded frames straight from the video stream,
+    detects faces, calculates POC, Vektor, and Quadran features.
+    Features are written straight into preallocated matrices (see FeatureMatrices).
+    With a preview_recorder, only the frame index, ROI coordinates and motion
+    vectors are kept; the preview URLs point at the lazy render endpoint.
+
+    Once the first face fixes the reference ROIs, later frames only depend on
+    themselves plus that reference. With FEATURE_EXTRACTION_WORKERS > 1 (and no
+    preview) they are fanned out in chunks to a process pool and merged back
+    in frame order.
+    progress(processed_frames), if given, is called as frames complete.
     """
-    quadran_data_list = []
-    all_features_data_list = []
+    # Without a frame limit the matrices start at 200 rows and grow as needed
+    features = FeatureMatrices(get_feature_schema(), capacity=app.config['FRAME_SAMPLING_MAX_FRAMES'] or 200)
+    with_preview = preview_recorder is not None
     preview_data_list = []
 
     data_blocks_first_image = {component_name: None for component_name in COMPONENTS_SETUP}
+    # Reference spectrum per component, computed once per request
+    spectrum_first_image = {component_name: None for component_name in COMPONENTS_SETUP}
+
+    tracker_options = _get_tracker_options()
+    face_tracker = FaceTracker(*get_face_models(), **tracker_options)
+
+    workers = app.config['FEATURE_EXTRACTION_WORKERS']
+    chunk_size = app.config['FEATURE_EXTRACTION_CHUNK_SIZE']
+    use_pool = workers > 1 and not with_preview
+    references = None
+    pending_chunk = []
+    chunk_futures = []
 
     frame_counter = 0
 
-    sorted_filenames = sorted(os.listdir(frames_dir), key=natural_sort_key)
+    for frame_name, image in frames:
+        filename = f"{frame_name}.jpg"
 
-    for filename in sorted_filenames:
-        if not (filename.endswith(".jpg") or filename.endswith(".png")):
-            continue
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
 
-        image_path = os.path.join(frames_dir, filename)
-        image = cv2.imread(image_path)
-        if image is None:
-            print(f"[WARN] Could not read image: {filename}")
+        # --- Parallel path: reference is fixed, hand the frame to the pool ---
+        if references is not None:
+            pending_chunk.append((features.addFrame(f"{frame_counter + 1}({frame_name})"), gray))
+            if len(pending_chunk) >= chunk_size:
+                chunk_futures.append(_submit_chunk(pool, references, pending_chunk))
+                pending_chunk = []
+            frame_counter += 1
             continue
 
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        rects = DLIB_DETECTOR(gray)
+        shapes = face_tracker.getShapes(gray)
 
         current_preview_data = {}
         if with_preview:
+            preview_recorder.addFrame(frame_name)
             current_preview_data = {
                 "name": filename,
-                "url": next((img['url'] for img in images_list if os.path.splitext(img['name'])[0] == os.path.splitext(filename)[0]), None),
+                "url": _get_preview_url(frames_dir, filename),
                 "components": {}
             }
 
         if frame_counter > 0:
-            current_frame_all_features = {'Frame': f"{frame_counter + 1}({filename.split('.')[0]})"}
-            current_frame_quadran_data = {'Frame': f"{frame_counter + 1}({filename.split('.')[0]})"}
-
-        for rect in rects:
-            shape = DLIB_PREDICTOR(gray, rect)
+            feature_row = features.addFrame(f"{frame_counter + 1}({frame_name})")
 
+        for shape in shapes:
             for component_name, component_info in COMPONENTS_SETUP.items():
 
-                sum_data_by_quadran = {
-                    column: {quadrant: 0 for quadrant in QUADRAN_DIMENSIONS}
-                    for column in FRAMES_DATA_QUADRAN_COMPONENTS
-                }
-
-                data_blocks_image_current, image_url = extract_component_by_images(
+                data_blocks_image_current = extract_component_by_images(
                     image=image,
                     shape=shape,
-                    frameName=filename.split(".")[0],
-                    objectName=component_info['object_name'],
                     objectRectangle=component_info['object_rectangle'],
                     pixelShifting=component_info['pixel_shifting'],
-                    objectDimension=component_info['object_dimension'],
-                    directoryOutputImage=frames_dir,
-                    withPreview=with_preview
+                    objectDimension=component_info['object_dimension']
                 )
 
                 if with_preview:
-                    current_preview_data["components"][component_name] = {"url_source": image_url}
+                    component_rect = get_component_rectangle(
+                        image.shape,
+                        shape,
+                        component_info['object_rectangle'],
+                        component_info['pixel_shifting'],
+                        component_info['object_dimension']
+                    )
+                    preview_recorder.setComponent(component_name, component_rect)
+                    current_preview_data["components"][component_name] = {
+                        "url_source": _get_preview_url(frames_dir, f"{component_info['object_name']}/{filename}")
+                    }
 
                 if data_blocks_first_image[component_name] is None:
                     data_blocks_first_image[component_name] = data_blocks_image_current
+                    spectrum_first_image[component_name] = POCSpectrum(data_blocks_image_current, BLOCKSIZE)
                     continue
 
-                initPOC = POC(data_blocks_first_image[component_name], data_blocks_image_current, BLOCKSIZE)
-                valPOC = initPOC.getPOC()
-
-                initQuiv = Vektor(valPOC, BLOCKSIZE)
-                quivData = initQuiv.getVektor()
-
-                initQuadran = Quadran(quivData)
-                quadran = initQuadran.getQuadran()
+                quivData, initQuadran, quadran = compute_component_features(
+                    data_blocks_first_image[component_name],
+                    spectrum_first_image[component_name],
+                    data_blocks_image_current
+                )
 
                 if with_preview:
-                    url_result = draw_quiver_and_save_plotlib_image(
-                        dataBlockImage=data_blocks_image_current,
-                        quivData=quivData,
-                        frameName=filename.split(".")[0],
-                        objectName=component_info['object_name'],
-                        directoryOutputImage=frames_dir
+                    preview_recorder.setComponent(component_name, component_rect, quivData)
+                    current_preview_data["components"][component_name]["url_result"] = _get_preview_url(
+                        frames_dir, f"{component_info['object_name']}/{frame_name}-quiver.jpg"
                     )
-                    current_preview_data["components"][component_name]["url_result"] = url_result
 
                 # --- Feature Aggregation ---
-                for i, quad in enumerate(quadran):
-                    current_frame_all_features[f'{component_name}-X{i+1}'] = quad[1]
-                    current_frame_all_features[f'{component_name}-Y{i+1}'] = quad[2]
-                    current_frame_all_features[f'{component_name}-Tetha{i+1}'] = quad[3]
-                    current_frame_all_features[f'{component_name}-Magnitude{i+1}'] = quad[4]
-
-                    quadrant_label = quad[5]
-                    if quadrant_label in QUADRAN_DIMENSIONS:
-                        sum_data_by_quadran['sumX'][quadrant_label] += quad[1]
-                        sum_data_by_quadran['sumY'][quadrant_label] += quad[2]
-                        sum_data_by_quadran['Tetha'][quadrant_label] += quad[3]
-                        sum_data_by_quadran['Magnitude'][quadrant_label] += quad[4]
-                        sum_data_by_quadran['JumlahQuadran'][quadrant_label] += 1
-
-                for quadran_dim in QUADRAN_DIMENSIONS:
-                    for feature in FRAMES_DATA_QUADRAN_COMPONENTS:
-                        column_name = f"{component_name}_{feature}_{quadran_dim}"
-                        current_frame_quadran_data[column_name] = sum_data_by_quadran[feature][quadran_dim]
-
-        if frame_counter > 0:
-            current_frame_quadran_data['Folder Path'] = "data_test"
-            current_frame_quadran_data['Label'] = "data_test"
-            quadran_data_list.append(current_frame_quadran_data)
-
-            current_frame_all_features['Folder Path'] = "data_test"
-            current_frame_all_features['Label'] = "data_test"
-            all_features_data_list.append(current_frame_all_features)
+                write_component_features(features, feature_row, component_name, initQuadran, quadran)
 
         if with_preview:
             preview_data_list.append(current_preview_data)
 
         frame_counter += 1
+        if progress is not None:
+            progress(frame_counter)
+
+        if use_pool and all(v is not None for v in data_blocks_first_image.values()):
+            references = {
+                component_name: (data_blocks_first_image[component_name], spectrum_first_image[component_name])
+                for component_name in COMPONENTS_SETUP
+            }
+            pool = get_extraction_pool(workers, DLIB_PREDICTOR_PATH, tracker_options)
+            print(f"[INFO] Reference ROI fixed, extracting remaining frames on {workers} worker processes.")
 
         # Stop processing if first image's blocks are still None (no faces found)
         if all(v is None for v in data_blocks_first_image.values()) and frame_counter > 10:
             print("[WARN] No faces detected in the first 10 frames. Aborting.")
             break
 
-    df_fitur_all = pd.DataFrame(all_features_data_list)
-    df_quadran = pd.DataFrame(quadran_data_list)
+    if pending_chunk:
+        chunk_futures.append(_submit_chunk(pool, references, pending_chunk))
+
+    # Merge worker results back in frame order
+    processed_frames = frame_counter - sum(future.frame_count for future in chunk_futures)
+    for future in chunk_futures:
+        rows, all_features_rows, quadran_rows = future.result()
+        features.allFeatures[rows] = all_features_rows
+        features.quadran[rows] = quadran_rows
+
+        processed_frames += future.frame_count
+        if progress is not None:
+            progress(processed_frames)
 
-    return df_fitur_all, df_quadran, preview_data_list
+    return features, preview_data_list
 
 
-def _save_feature_dataframes(df_fitur_all, df_quadran, new_filename_base):
+def _submit_chunk(pool, references, chunk):
     """
-    Saves the extracted feature DataFrames to CSV and Excel files.
-    Returns a dictionary of public URLs for the saved files.
+    Sends one chunk of frames to the extraction pool.
+    The returned future remembers its frame count for progress reporting.
     """
-    output_csv_dir = os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_DATA'], new_filename_base)
-    os.makedirs(output_csv_dir, exist_ok=True)
+    future = pool.submit(extract_features_chunk, references, chunk)
+    future.frame_count = len(chunk)
+    return future
 
-    # --- Save 'nilai-fitur-all-component' ---
-    nilai_fitur_all_path_csv = os.path.join(output_csv_dir, 'nilai-fitur-all-component.csv')
-    df_fitur_all.to_csv(nilai_fitur_all_path_csv, index=False, float_format=None)
 
-    nilai_fitur_all_path_xlsx = os.path.join(output_csv_dir, 'nilai-fitur-all-component.xlsx')
-    df_fitur_all.to_excel(nilai_fitur_all_path_xlsx, index=False, float_format=None)
+def _get_tracker_options():
+    """
+    Face detection/tracking options from the app config (see FaceTracker).
+    """
+    return {
+        "mode": app.config['FACE_DETECTION_MODE'],
+        "detectionInterval": app.config['FACE_DETECTION_INTERVAL'],
+        "roiMargin": app.config['FACE_TRACKING_MARGIN'],
+        "detectionScale": app.config['FACE_DETECTION_SCALE'],
+        "upsample": app.config['FACE_DETECTION_UPSAMPLE'],
+    }
 
-    # --- Save '4qmv-all-component' ---
-    nilai_4qmv_path_csv = os.path.join(output_csv_dir, '4qmv-all-component.csv')
-    df_quadran.to_csv(nilai_4qmv_path_csv, index=False, float_format=None)
 
-    nilai_4qmv_path_xlsx = os.path.join(output_csv_dir, '4qmv-all-component.xlsx')
-    df_quadran.to_excel(nilai_4qmv_path_xlsx, index=False, float_format=None) # Note: Original code used .to_csv here, fixed to .to_excel
+def _save_feature_matrices(features, new_filename_base):
+    """
+    Saves the extracted feature matrices as compressed NPZ.
+    Returns a dictionary of public download URLs for the CSV/Excel tables,
+    which are converted from the NPZ on first download (see show_feature_export).
+    """
+    output_csv_dir = os.path.join(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_FOLDER_DATA'], new_filename_base)
+    save_feature_matrices(features, output_csv_dir)
 
     # --- Generate Public URLs ---
     with app.app_context():
         csv_urls = {
-            "nilai_fitur_asli_csv": url_for('static', filename=nilai_fitur_all_path_csv.replace('\\', '/').replace('assets/', '', 1), _external=True),
-            "nilai_fitur_asli_xlsx": url_for('static', filename=nilai_fitur_all_path_xlsx.replace('\\', '/').replace('assets/', '', 1), _external=True),
-            "nilai_4qmv_csv": url_for('static', filename=nilai_4qmv_path_csv.replace('\\', '/').replace('assets/', '', 1), _external=True),
-            "nilai_4qmv_xlsx": url_for('static', filename=nilai_4qmv_path_xlsx.replace('\\', '/').replace('assets/', '', 1), _external=True),
+            "nilai_fitur_asli_csv": url_for('feature_export', video_name=new_filename_base, filename='nilai-fitur-all-component.csv', _external=True),
+            "nilai_fitur_asli_xlsx": url_for('feature_export', video_name=new_filename_base, filename='nilai-fitur-all-component.xlsx', _external=True),
+            "nilai_4qmv_csv": url_for('feature_export', video_name=new_filename_base, filename='4qmv-all-component.csv', _external=True),
+            "nilai_4qmv_xlsx": url_for('feature_export', video_name=new_filename_base, filename='4qmv-all-component.xlsx', _external=True),
         }
     return csv_urls
 
 
-def _prepare_feature_sets(df_fitur_all, df_quadran, except_columns):
+def _prepare_feature_sets(df_for_all, df_for_4qmv):
     """
-    Applies preprocessing like PCA and Hybrid Feature Selection
-    to the raw feature DataFrames.
-    Returns a dictionary of prepared DataFrames ready for prediction.
+    Binds the raw feature-only DataFrames (no Frame/Folder Path/Label columns)
+    to FEATURE_GRAPH. Transforms (scaling, PCA, hybrid selection) are computed
+    lazily when a model asks for them, once per request.
+    Returns the TransformResults for this request.
     """
-    feature_sets = {}
-
-    # --- Base Features ---
-    df_for_all = df_fitur_all.drop(columns=except_columns)
-    df_for_4qmv = df_quadran.drop(columns=except_columns)
-
-    feature_sets["fitur_all_component"] = df_for_all
-    feature_sets["4qmv_all_component"] = df_for_4qmv
-
-    # --- PCA Features ---
-    if SCALERS['default'] and PCA_MODEL:
-        df_scaled_pca = SCALERS['default'].transform(df_for_all)
-        df_pca_transformed = PCA_MODEL.transform(df_scaled_pca)
-        feature_sets["fitur_pca_component"] = pd.DataFrame(df_pca_transformed)
+    return FEATURE_GRAPH.evaluate({"fitur_all": df_for_all, "4qmv_all": df_for_4qmv})
 
-    # --- LDA Features ---
-    # LDA model expects the 'fitur_all_component' data
-    feature_sets["full_model_lda"] = df_for_all.copy()
 
-    # --- Hybrid Features ---
-    if HYBRID_FEATURE_INFO and SCALERS['hybrid']:
-        df_scaled_hybrid = SCALERS['hybrid'].transform(df_for_all)
-
-        if HYBRID_FEATURE_INFO['method'] == 'direct_from_exploration':
-            selected_features = HYBRID_FEATURE_INFO['selected_features']
-            df_hybrid = pd.DataFrame(df_scaled_hybrid, columns=df_for_all.columns)[selected_features]
-
-        elif HYBRID_PREFILTER and HYBRID_RFE:
-            df_prefiltered = HYBRID_PREFILTER.transform(df_scaled_hybrid)
-            df_selected = HYBRID_RFE.transform(df_prefiltered)
-            df_hybrid = pd.DataFrame(df_selected)
-
-        else:
-            print("[WARN] Hybrid feature preprocessors not found.")
-            df_hybrid = pd.DataFrame() # Empty
-
-        feature_sets["hybrid_component"] = df_hybrid
-
-    return feature_sets
-
-
-def _run_single_prediction(model, scaler, label_encoder, data):
+def _run_single_prediction(model, label_encoder, data):
     """
     Helper function to run prediction on a single model setup.
-    Handles scaling, prediction, timing, and decoding.
+    Handles prediction, timing, and decoding of already transformed data.
     """
     try:
-        if data.empty:
+        if len(data) == 0 or data.shape[1] == 0:
             return {"error": "Empty data frame."}
 
-        # Apply scaling if a scaler is provided
-        if scaler:
-            data = scaler.transform(data)
-
         start_time = time.time()
         predictions = model.predict(data)
         end_time = time.time()
@@ -469,35 +808,74 @@ def _run_single_prediction(model, scaler, label_encoder, data):
         return {"error": str(e)}
 
 
-def _run_all_predictions(feature_sets):
+def _predict_model_group(feature_sets, metode_key, config):
     """
-    Iterates through the globally loaded models and runs predictions
-    using the corresponding prepared feature sets.
+    Runs one model group entry: resolves the model and encoder, reads its
+    transform node from feature_sets and predicts. Safe to run in parallel.
     """
-    predictions_result_all = {}
-
-    for train_model_key, train_model_data in GLOBAL_MODELS.items():
-        predictions_result_all[train_model_key] = {}
+    model = MODEL_REGISTRY.get(config['model'])
+    label_encoder = MODEL_REGISTRY.get(config['label_encoder'])
+    if model is None or label_encoder is None:
+        return {"error": f"Model '{config['model']}' is not available."}
 
-        for metode_key, config in train_model_data.items():
+    try:
+        data = feature_sets.get(config['features'])
+    except Exception as e:
+        # The transform error is shared by every model reading the same node
+        print(f"[WARN] Feature transform '{config['features']}' failed for {metode_key}: {e}")
+        return {"error": str(e)}
+    return _run_single_prediction(model=model, label_encoder=label_encoder, data=data)
 
-            if metode_key not in feature_sets:
-                print(f"[WARN] Feature set '{metode_key}' not found. Skipping prediction.")
-                continue
 
-            data = feature_sets[metode_key]
+def _run_all_predictions(feature_sets, progress=None):
+    """
+    Runs every entry of the model groups (resolved through the registry) on the
+    transform node it reads from feature_sets (TransformResults). Entries run
+    concurrently on PREDICTION_EXECUTOR when it is enabled.
+    Each finished model is reported through progress('prediction', ...) right away;
+    the returned results keep the MODEL_GROUPS order regardless of finishing order.
+    """
+    tasks = [
+        (train_model_key, metode_key, config)
+        for train_model_key, train_model_data in MODEL_GROUPS.items()
+        for metode_key, config in train_model_data.items()
+    ]
+
+    results = {}
+    if PREDICTION_EXECUTOR is None:
+        for train_model_key, metode_key, config in tasks:
+            results[(train_model_key, metode_key)] = _predict_model_group(feature_sets, metode_key, config)
+            _report_prediction(progress, train_model_key, metode_key, results[(train_model_key, metode_key)])
+    else:
+        futures = {
+            PREDICTION_EXECUTOR.submit(_predict_model_group, feature_sets, metode_key, config): (train_model_key, metode_key)
+            for train_model_key, metode_key, config in tasks
+        }
+        for future in as_completed(futures):
+            train_model_key, metode_key = futures[future]
+            results[(train_model_key, metode_key)] = future.result()
+            _report_prediction(progress, train_model_key, metode_key, results[(train_model_key, metode_key)])
 
-            result = _run_single_prediction(
-                model=config['model'],
-                scaler=config['scaler'],
-                label_encoder=config['label_encoder'],
-                data=data
-            )
-            predictions_result_all[train_model_key][metode_key] = result
+    predictions_result_all = {train_model_key: {} for train_model_key in MODEL_GROUPS}
+    for train_model_key, metode_key, _ in tasks:
+        predictions_result_all[train_model_key][metode_key] = results[(train_model_key, metode_key)]
 
     return predictions_result_all
 
 
+def _report_prediction(progress, train_model_key, metode_key, result):
+    if "error" in result:
+        _report(progress, 'prediction', model=f"{metode_key}with{train_model_key}", error=result['error'])
+    else:
+        _report(
+            progress, 'prediction',
+            model=f"{metode_key}with{train_model_key}",
+            result=result['result_prediction'],
+            list_predictions=result['list_predictions'],
+            testing_time_seconds=result['testing_time_seconds']
+        )
+
+
 def _format_api_response(video_info, csv_urls, predictions_result_all, preview_data_list, with_preview):
     """
     Constructs the final JSON response dictionary from all processed data.
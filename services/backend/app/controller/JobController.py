@@ -0,0 +1,193 @@
+import os
+import json
+import time
+import uuid
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from flask import request, url_for, Response, stream_with_context
+from app import response, app
+from app.controller import DataModelController
+from app.request.DataModel.DataTestStoreRequest import DataTestStoreRequest
+from app.helper.jobs import JobStore, JobEvents, JOB_STATUS_RUNNING, JOB_STATUS_FINISHED, JOB_STATUS_FAILED
+
+# ==============================================================================
+# JOB STORE AND WORKER POOL
+# ==============================================================================
+# Video analysis runs on a local thread pool instead of the request thread.
+# Job status and the final payload are persisted in SQLite under assets/.
+# Progress events live in memory only and are streamed as Server-Sent Events,
+# so with several gunicorn workers requests need sticky routing (gunicorn.conf.py).
+# ==============================================================================
+
+JOB_STORE = JobStore(os.path.join(app.config['UPLOAD_FOLDER'], app.config['JOB_DATABASE']))
+JOB_EXECUTOR = ThreadPoolExecutor(max_workers=app.config['JOB_WORKERS'], thread_name_prefix='job-worker')
+JOB_EVENTS = JobEvents()
+SSE_HEARTBEAT_SECONDS = 15
+# Running jobs refresh their heartbeat at most this often (seconds)
+JOB_HEARTBEAT_SECONDS = 10
+
+
+def recover_jobs():
+    """
+    Marks queued/running jobs whose owner process is gone (or whose heartbeat
+    is older than JOB_STALE_TIMEOUT) as failed. Called once at server start by
+    the process that owns the workers (gunicorn.conf.py when_ready, app.py);
+    importing the app never touches jobs of other processes.
+    """
+    orphaned = JOB_STORE.recoverOrphaned(app.config['JOB_STALE_TIMEOUT'])
+    if orphaned:
+        print(f"[WARN] Marked {len(orphaned)} interrupted job(s) as failed.")
+    return orphaned
+
+
+# ==============================================================================
+# API CONTROLLER
+# ==============================================================================
+
+def store():
+    """
+    Accepts the same form as DataModelController.store(), saves the upload
+    and queues the analysis. Returns the job id immediately (202).
+    """
+    request_data = DataTestStoreRequest()
+    if not request_data.validate():
+        return response.error(422, 'Invalid request form validation', request_data.errors)
+
+    file = request_data.file.data
+    with_preview = request_data.with_preview.data
+    new_filename_base = f'video-{str(uuid.uuid4())}'
+    job_id = str(uuid.uuid4())
+
+    try:
+        file_path_video = DataModelController.save_uploaded_video(file, new_filename_base)
+        JOB_STORE.create(job_id, os.path.basename(file_path_video))
+        JOB_EVENTS.open(job_id)
+
+        # URLs in the result are built against the host the client used
+        JOB_EXECUTOR.submit(_run_job, job_id, request.url_root, file_path_video, new_filename_base, with_preview)
+        print(f"[INFO] Job {job_id} queued for {os.path.basename(file_path_video)}.")
+
+    except Exception as e:
+        traceback.print_exc()
+        return response.error(500, message=f"An internal server error occurred: {e}")
+
+    return response.success(202, 'Accepted', _format_job(JOB_STORE.get(job_id)))
+
+def show(job_id):
+    """
+    Returns the status of a job.
+    """
+    job = JOB_STORE.get(job_id)
+    if job is None:
+        return response.error(404, "Job not found")
+
+    return response.success(200, 'Ok', _format_job(job))
+
+def show_result(job_id):
+    """
+    Returns the final payload of a finished job, in the same shape as
+    the synchronous POST /data-model/data-test response.
+    """
+    job = JOB_STORE.get(job_id)
+    if job is None:
+        return response.error(404, "Job not found")
+
+    if job['status'] == JOB_STATUS_FAILED:
+        return response.error(message=job['error'])
+
+    if job['status'] != JOB_STATUS_FINISHED:
+        return response.success(202, 'Job is not finished yet', _format_job(job))
+
+    return response.success(200, 'Ok', job['result'])
+
+def show_events(job_id):
+    """
+    Streams job progress as Server-Sent Events: 'stage' transitions,
+    'frames' (processed/total), one 'prediction' per finished model and
+    a final 'finished' or 'failed' event, after which the stream closes.
+    """
+    job = JOB_STORE.get(job_id)
+    if job is None:
+        return response.error(404, "Job not found")
+
+    def generate():
+        if not JOB_EVENTS.has(job_id):
+            # Events are gone (server restart or an old job): report the stored status once
+            yield _format_sse(job['status'], _format_job(job))
+            return
+
+        for item in JOB_EVENTS.subscribe(job_id, heartbeat=SSE_HEARTBEAT_SECONDS):
+            if item is None:
+                yield ": heartbeat\n\n"
+            else:
+                yield _format_sse(*item)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+# ==============================================================================
+# HELPER FUNCTIONS (Private)
+# ==============================================================================
+
+def _run_job(job_id, base_url, file_path_video, new_filename_base, with_preview):
+    """
+    Runs the pipeline for one job on a worker thread and records the outcome.
+    """
+    JOB_STORE.update(job_id, status=JOB_STATUS_RUNNING, heartbeat_at=time.time())
+    print(f"[START] Job {job_id} running.")
+    last_heartbeat = time.monotonic()
+
+    def progress(event, data):
+        nonlocal last_heartbeat
+        if event == 'stage':
+            JOB_STORE.update(job_id, stage=data['stage'])
+        if time.monotonic() - last_heartbeat >= JOB_HEARTBEAT_SECONDS:
+            JOB_STORE.heartbeat(job_id)
+            last_heartbeat = time.monotonic()
+        JOB_EVENTS.publish(job_id, event, data)
+
+    try:
+        with app.test_request_context(base_url=base_url):
+            response_data, error = DataModelController.process_video(file_path_video, new_filename_base, with_preview, progress=progress)
+
+            if error:
+                print(f"[WARN] Job {job_id} failed: {error}")
+                JOB_STORE.update(job_id, status=JOB_STATUS_FAILED, error=error)
+            else:
+                JOB_STORE.update(job_id, status=JOB_STATUS_FINISHED, result=response_data)
+                print(f"[SUCCESS] Job {job_id} finished.\n")
+
+            job = JOB_STORE.get(job_id)
+            JOB_EVENTS.publish(job_id, job['status'], _format_job(job), close=True)
+
+    except Exception as e:
+        print(f"[ERROR] Unhandled exception in job {job_id}: {e}")
+        traceback.print_exc()
+        JOB_STORE.update(job_id, status=JOB_STATUS_FAILED, error=f"An internal server error occurred: {e}")
+        JOB_EVENTS.publish(job_id, JOB_STATUS_FAILED, {"job_id": job_id, "error": str(e)}, close=True)
+
+def _format_job(job):
+    """
+    Public view of a job record (without the payload itself).
+    """
+    return {
+        "job_id": job['id'],
+        "status": job['status'],
+        "stage": job['stage'],
+        "video_name": job['video_name'],
+        "error": job['error'],
+        "created_at": job['created_at'],
+        "updated_at": job['updated_at'],
+        "status_url": url_for('job_status', job_id=job['id'], _external=True),
+        "result_url": url_for('job_result', job_id=job['id'], _external=True),
+        "events_url": url_for('job_events', job_id=job['id'], _external=True),
+    }
+
+def _format_sse(event, data):
+    """
+    Serializes one event in the text/event-stream format.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
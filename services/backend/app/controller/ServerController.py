@@ -0,0 +1,14 @@
+from app import response
+from app.helper.server import get_worker_memory_report
+
+# ==============================================================================
+# API CONTROLLER
+# ==============================================================================
+
+def show_workers():
+    """
+    Reports resident memory (RSS/PSS, shared vs private) of the server
+    workers. Under gunicorn the master and every sibling worker are included,
+    so copy-on-write sharing of the preloaded models can be checked.
+    """
+    return response.success(200, 'Ok', get_worker_memory_report())
@@ -0,0 +1,212 @@
+import os
+import time
+import uuid
+import tempfile
+import traceback
+import cv2
+import numpy as np
+from collections import deque
+from flask import request, url_for
+from werkzeug.utils import secure_filename
+from app import response, app
+from app.controller import DataModelController
+from app.helper.preprocessing import get_frames_stream_by_input_video
+from app.helper.stream import StreamSession, StreamSessionStore
+
+# ==============================================================================
+# STREAM SESSIONS
+# ==============================================================================
+# Webcam frames are pushed in small batches while they are captured and run
+# through the same POC/Vektor/Quadran extraction against a held reference ROI.
+# Sessions live in memory only (one worker process, see gunicorn.conf.py) and
+# expire after STREAM_IDLE_TIMEOUT seconds.
+# ==============================================================================
+
+STREAM_SESSIONS = StreamSessionStore(
+    maxSessions=app.config['STREAM_MAX_SESSIONS'],
+    idleTimeout=app.config['STREAM_IDLE_TIMEOUT']
+)
+
+STREAM_IMAGE_EXTENSIONS = ['jpg', 'jpeg', 'png', 'webp', 'bmp']
+STREAM_VIDEO_EXTENSIONS = ['mp4', 'mkv', 'avi', 'mov', 'webm']
+
+
+# ==============================================================================
+# API CONTROLLER
+# ==============================================================================
+
+def store():
+    """
+    Opens a streaming session. Frames are then posted to its frames_url.
+    """
+    detector, predictor = DataModelController.get_face_models()
+    if detector is None or predictor is None:
+        return response.error(503, "Face detection models are not loaded")
+
+    session = StreamSession(
+        str(uuid.uuid4()),
+        detector,
+        predictor,
+        DataModelController._get_tracker_options(),
+        windowSize=app.config['STREAM_WINDOW_SIZE']
+    )
+    if not STREAM_SESSIONS.add(session):
+        return response.error(429, "Too many active streaming sessions")
+
+    print(f"[INFO] Stream session {session.id} opened.")
+    return response.success(201, 'Created', _format_session(session))
+
+def show(session_id):
+    """
+    Returns the counters and current rolling predictions of a session.
+    """
+    session = STREAM_SESSIONS.get(session_id)
+    if session is None:
+        return response.error(404, "Stream session not found")
+
+    return response.success(200, 'Ok', {
+        **_format_session(session),
+        "rolling": session.getRollingPredictions(),
+    })
+
+def store_frames(session_id):
+    """
+    Accepts one or more captured frames (images) or short self-contained
+    video segments in the multipart field 'frames', extracts features frame
+    by frame and returns per-frame plus rolling predictions.
+
+    Only the newest STREAM_MAX_FRAMES_PER_REQUEST frames of a request are
+    processed, older ones are dropped so latency stays bounded when the
+    client falls behind.
+    """
+    session = STREAM_SESSIONS.get(session_id)
+    if session is None:
+        return response.error(404, "Stream session not found")
+
+    files = [file for file in request.files.getlist('frames') if file and file.filename]
+    if not files:
+        return response.error(422, 'Invalid request form validation', {"frames": ["At least one frame is required"]})
+
+    try:
+        start_time = time.time()
+
+        with session.lock:
+            session.touch()
+            frames, error = _decode_frames(session, files)
+            if error:
+                return response.error(422, 'Invalid request form validation', {"frames": [error]})
+
+            features, frame_results = session.extractFeatures(frames)
+            if len(features):
+                _add_frame_predictions(session, features, frame_results)
+
+            session.touch()
+
+        return response.success(200, 'Ok', {
+            **_format_session(session),
+            "frames": frame_results,
+            "rolling": session.getRollingPredictions(),
+            "processing_time_seconds": round(time.time() - start_time, 4),
+        })
+
+    except Exception as e:
+        print(f"[ERROR] Unhandled exception in stream session {session_id}: {e}")
+        traceback.print_exc()
+        return response.error(500, message=f"An internal server error occurred: {e}")
+
+def destroy(session_id):
+    """
+    Closes a session and returns its final rolling predictions.
+    """
+    session = STREAM_SESSIONS.remove(session_id)
+    if session is None:
+        return response.error(404, "Stream session not found")
+
+    print(f"[INFO] Stream session {session.id} closed after {session.framesReceived} frames.")
+    return response.success(200, 'Ok', {
+        **session.toDict(),
+        "rolling": session.getRollingPredictions(),
+    })
+
+# ==============================================================================
+# HELPER FUNCTIONS (Private)
+# ==============================================================================
+
+def _decode_frames(session, files):
+    """
+    Decodes the posted files into (frame_index, image) pairs, keeping only
+    the newest STREAM_MAX_FRAMES_PER_REQUEST. Returns (frames, error).
+    """
+    max_frames = app.config['STREAM_MAX_FRAMES_PER_REQUEST']
+    frames = deque(maxlen=max_frames)
+    received = 0
+
+    for file in files:
+        file_extension = secure_filename(file.filename).split('.')[-1].lower()
+
+        if file_extension in STREAM_IMAGE_EXTENSIONS:
+            image = cv2.imdecode(np.frombuffer(file.read(), np.uint8), cv2.IMREAD_COLOR)
+            if image is None:
+                return None, f"Failed to decode frame {file.filename}"
+            frames.append((session.framesReceived + received + 1, image))
+            received += 1
+
+        elif file_extension in STREAM_VIDEO_EXTENSIONS:
+            # OpenCV only decodes from a path, the segment is removed right after
+            file_descriptor, segment_path = tempfile.mkstemp(suffix=f".{file_extension}")
+            os.close(file_descriptor)
+            try:
+                file.save(segment_path)
+                segment_frames, error = get_frames_stream_by_input_video(
+                    segment_path,
+                    targetFps=app.config['FRAME_SAMPLING_TARGET_FPS'],
+                    stride=app.config['FRAME_SAMPLING_STRIDE']
+                )
+                if error:
+                    return None, error
+
+                for _, image in segment_frames:
+                    frames.append((session.framesReceived + received + 1, image))
+                    received += 1
+            finally:
+                os.remove(segment_path)
+
+        else:
+            return None, f"Unsupported frame format: {file_extension}"
+
+    session.framesReceived += received
+    session.framesDropped += received - len(frames)
+    return list(frames), None
+
+def _add_frame_predictions(session, features, frame_results):
+    """
+    Runs all models on the extracted rows, attaches each frame's labels to
+    its entry in frame_results and feeds them into the rolling window.
+    """
+    results_by_frame = {item['frame']: item for item in frame_results}
+    for frame_index in features.frames:
+        results_by_frame[frame_index]['prediction'] = {}
+
+    predictions_result_all = DataModelController.predict_features(features)
+
+    for train_key, methods in predictions_result_all.items():
+        for metode_key, result in methods.items():
+            if "error" in result:
+                continue
+
+            key_name = f"{metode_key}with{train_key}"
+            labels = result['decoded_predictions'].tolist()
+            for frame_index, label in zip(features.frames, labels):
+                results_by_frame[frame_index]['prediction'][key_name] = label
+
+            session.addPredictions(key_name, labels)
+
+def _format_session(session):
+    """
+    Public view of a session with the URLs the client needs.
+    """
+    return {
+        **session.toDict(),
+        "frames_url": url_for('stream_frames', session_id=session.id, _external=True),
+        "session_url": url_for('stream_session', session_id=session.id, _external=True),
+    }
@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+# Output analisis (video, fitur, preview) yang belum dimiliki entry cache dan lebih muda dari
+# ini (detik) tidak dihapus karena batas ukuran: bisa jadi request-nya masih berjalan
+OUTPUT_GRACE_SECONDS = 60 * 60
+
+def get_file_sha256(filepath, chunkSize=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunkSize), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def get_file_fingerprints(directory):
+    # Nama, ukuran dan waktu modifikasi setiap file model: berubah jika model diganti
+    if not os.path.isdir(directory):
+        return []
+    return [
+        [filename, os.path.getsize(os.path.join(directory, filename)), os.stat(os.path.join(directory, filename)).st_mtime_ns]
+        for filename in sorted(os.listdir(directory))
+        if os.path.isfile(os.path.join(directory, filename))
+    ]
+
+def get_path_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, filename))
+        for root, _, filenames in os.walk(path)
+        for filename in filenames
+    )
+
+def remove_path(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+def get_output_name(path):
+    # Nama dasar output satu request (video-<uuid>), sama untuk video, fitur dan folder preview
+    return os.path.splitext(os.path.basename(path))[0]
+
+def split_url_root(value, urlRoot, urlPaths, path=()):
+    """
+    Salinan value dengan setiap string yang diawali urlRoot dijadikan relatif.
+    Lokasi field-field tersebut (list key/index) ditambahkan ke urlPaths.
+    """
+    if isinstance(value, dict):
+        return {key: split_url_root(item, urlRoot, urlPaths, path + (key,)) for key, item in value.items()}
+    if isinstance(value, list):
+        return [split_url_root(item, urlRoot, urlPaths, path + (index,)) for index, item in enumerate(value)]
+    if isinstance(value, str) and value.startswith(urlRoot):
+        urlPaths.append(list(path))
+        return value[len(urlRoot):]
+    return value
+
+def join_url_root(value, urlRoot, urlPaths):
+    # Kebalikan split_url_root: hanya field yang tercatat di urlPaths yang diubah
+    for path in urlPaths:
+        container = value
+        for key in path[:-1]:
+            container = container[key]
+        container[path[-1]] = urlRoot + container[path[-1]]
+    return value
+
+class ResultCache:
+    """
+    Cache hasil analisis berdasarkan isi video (sha256) dan konfigurasi pipeline.
+    Setiap entry adalah file JSON berisi response akhir (URL disimpan relatif
+    terhadap url root request) beserta daftar file di assets/ yang dirujuk
+    response tersebut (video, fitur, preview) dan ukurannya.
+
+    Batas maxBytes berlaku untuk semua output analisis di outputDirectories, bukan
+    hanya milik cache: output tanpa entry (cache gagal, request gagal, job) ikut
+    dihitung dan dihapus jika lebih tua dari maxAge. Entry yang lebih tua dari
+    maxAge dihapus, lalu yang paling lama tidak dipakai sampai total ukuran tidak
+    lebih dari maxBytes. Eviction berjalan di background thread (lihat maybeEvict).
+    """
+    def __init__(self, directory, maxBytes, maxAge, outputDirectories=(), evictInterval=600):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.maxAge = maxAge
+        self.outputDirectories = list(outputDirectories)
+        self.evictInterval = evictInterval
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        # Perkiraan total ukuran sejak eviction terakhir, untuk memicu eviction lebih awal
+        self.knownBytes = 0
+        self.lastEvict = 0.0
+        self.evictThread = None
+
+    def getKey(self, filepath, fingerprint):
+        digest = hashlib.sha256(get_file_sha256(filepath).encode())
+        digest.update(json.dumps(fingerprint, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def getEntryPath(self, key):
+        return os.path.join(self.directory, f'{key}.json')
+
+    def get(self, key, urlRoot):
+        """
+        Response yang tersimpan (URL digabung dengan urlRoot request sekarang),
+        atau None jika tidak ada / file assets-nya sudah tidak lengkap.
+        """
+        entryPath = self.getEntryPath(key)
+        with self.lock:
+            if not os.path.exists(entryPath):
+                return None
+
+            with open(entryPath) as file:
+                entry = json.load(file)
+
+            if not all(os.path.exists(path) for path in entry['paths']):
+                self.removeEntry(entryPath, entry)
+                return None
+
+            if 'url_paths' not in entry:
+                # Format lama (URL absolut), ditimpa oleh put() berikutnya
+                return None
+
+            # Waktu akses terakhir untuk eviction berdasarkan ukuran
+            os.utime(entryPath)
+
+        return join_url_root(entry['response'], urlRoot, entry['url_paths'])
+
+    def put(self, key, response, urlRoot, paths, optionalPaths=()):
+        urlPaths = []
+        entry = {
+            "created_at": time.time(),
+            "url_paths": urlPaths,
+            "response": split_url_root(response, urlRoot, urlPaths),
+            "paths": list(paths),
+            "optional_paths": list(optionalPaths),
+            "size": sum(get_path_size(path) for path in list(paths) + list(optionalPaths) if os.path.exists(path)),
+        }
+
+        entryPath = self.getEntryPath(key)
+        with self.lock:
+            with open(f'{entryPath}.tmp', 'w') as file:
+                json.dump(entry, file)
+            os.replace(f'{entryPath}.tmp', entryPath)
+            self.knownBytes += entry['size']
+
+    def removeEntry(self, entryPath, entry):
+        for path in entry['paths'] + entry['optional_paths']:
+            remove_path(path)
+        remove_path(entryPath)
+
+    def maybeEvict(self):
+        """
+        Menjalankan evict() di background thread jika perkiraan ukuran melewati
+        maxBytes atau eviction terakhir lebih dari evictInterval detik yang lalu.
+        Tidak menunggu; paling banyak satu eviction berjalan sekaligus.
+        """
+        with self.lock:
+            due = self.knownBytes > self.maxBytes or time.monotonic() - self.lastEvict >= self.evictInterval
+            if not due or (self.evictThread is not None and self.evictThread.is_alive()):
+                return False
+            self.lastEvict = time.monotonic()
+            self.evictThread = threading.Thread(target=self.evict, name='result-cache-evict', daemon=True)
+            self.evictThread.start()
+            return True
+
+    def getUnownedOutputs(self, ownedNames):
+        # Output analisis per nama dasar yang tidak dirujuk entry cache mana pun: {nama: [path]}
+        outputs = {}
+        for directory in self.outputDirectories:
+            if not os.path.isdir(directory):
+                continue
+            for filename in os.listdir(directory):
+                name = get_output_name(filename)
+                if name.startswith('video-') and name not in ownedNames:
+                    outputs.setdefault(name, []).append(os.path.join(directory, filename))
+        return outputs
+
+    def evict(self):
+        """
+        Menghapus entry dan output yang kedaluwarsa serta yang melebihi batas ukuran.
+        Mengembalikan jumlah entry/output yang dihapus.
+        """
+        removed = 0
+        now = time.time()
+
+        with self.lock:
+            candidates = []
+            ownedNames = set()
+            for filename in os.listdir(self.directory):
+                if not filename.endswith('.json'):
+                    continue
+
+                entryPath = os.path.join(self.directory, filename)
+                try:
+                    with open(entryPath) as file:
+                        entry = json.load(file)
+                except (OSError, ValueError):
+                    continue
+
+                if now - entry['created_at'] > self.maxAge:
+                    self.removeEntry(entryPath, entry)
+                    removed += 1
+                    continue
+
+                ownedNames.update(get_output_name(path) for path in entry['paths'] + entry['optional_paths'])
+                size = entry['size'] if 'size' in entry else sum(get_path_size(path) for path in entry['paths'] + entry['optional_paths'] if os.path.exists(path))
+                candidates.append((os.path.getmtime(entryPath), size, lambda entryPath=entryPath, entry=entry: self.removeEntry(entryPath, entry)))
+
+            for name, paths in self.getUnownedOutputs(ownedNames).items():
+                modifiedAt = max(os.path.getmtime(path) for path in paths)
+                if now - modifiedAt > self.maxAge:
+                    for path in paths:
+                        remove_path(path)
+                    removed += 1
+                elif now - modifiedAt > OUTPUT_GRACE_SECONDS:
+                    size = sum(get_path_size(path) for path in paths)
+                    candidates.append((modifiedAt, size, lambda paths=paths: [remove_path(path) for path in paths]))
+
+            # Yang paling lama tidak dipakai dihapus lebih dulu
+            totalSize = sum(size for _, size, _ in candidates)
+            for _, size, remove in sorted(candidates, key=lambda item: item[0]):
+                if totalSize <= self.maxBytes:
+                    break
+                remove()
+                totalSize -= size
+                removed += 1
+
+            self.knownBytes = totalSize
+
+        if removed:
+            print(f"[INFO] Evicted {removed} cached result(s)/output(s).")
+        return removed
@@ -22,3 +22,6 @@ MODEL_SVM_EXTRACTION_FEATURE = "label_encoder.joblib"
 #MODEL_SVM_4QMV = "svm_model_4qmv.joblib"
 QUADRAN_DIMENSIONS = ['Q1', 'Q2', 'Q3', 'Q4']
 FRAMES_DATA_QUADRAN_COMPONENTS = ['sumX', 'sumY', 'Tetha', 'Magnitude', 'JumlahQuadran']
+
+# Format video yang bisa langsung diputar browser tanpa transcode
+BROWSER_PLAYABLE_VIDEO_EXTENSIONS = ['webm', 'mp4']
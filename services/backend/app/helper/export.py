@@ -0,0 +1,47 @@
+import os
+from app.helper.schema import FeatureMatrices
+
+# File matriks fitur yang ditulis saat request, CSV/XLSX dibuat dari file ini saat diunduh
+FEATURE_MATRICES_FILENAME = 'features.npz'
+
+# Nama file ekspor (tanpa ekstensi) -> indeks DataFrame pada FeatureMatrices.getExportDataFrames()
+EXPORT_TABLES = {
+    'nilai-fitur-all-component': 0,
+    '4qmv-all-component': 1,
+}
+EXPORT_FORMATS = ['csv', 'xlsx']
+
+def save_feature_matrices(features: FeatureMatrices, directory):
+    os.makedirs(directory, exist_ok=True)
+    filepath = os.path.join(directory, FEATURE_MATRICES_FILENAME)
+    features.save(filepath)
+    return filepath
+
+def has_feature_matrices(directory):
+    return os.path.exists(os.path.join(directory, FEATURE_MATRICES_FILENAME))
+
+def parse_export_filename(filename):
+    # 'nilai-fitur-all-component.csv' -> ('nilai-fitur-all-component', 'csv'), None jika tidak dikenal
+    tableName, _, fileFormat = filename.rpartition('.')
+    if tableName not in EXPORT_TABLES or fileFormat not in EXPORT_FORMATS:
+        return None
+    return tableName, fileFormat
+
+def convert_feature_table(directory, tableName, fileFormat):
+    """
+    Menulis satu tabel fitur sebagai CSV/XLSX dari features.npz, isinya sama
+    dengan ekspor sinkron sebelumnya. File ditulis ke nama sementara lalu
+    dipindahkan, jadi file yang sudah ada selalu lengkap.
+    """
+    features = FeatureMatrices.load(os.path.join(directory, FEATURE_MATRICES_FILENAME))
+    df = features.getExportDataFrames()[EXPORT_TABLES[tableName]]
+
+    filepath = os.path.join(directory, f'{tableName}.{fileFormat}')
+    filepathTmp = os.path.join(directory, f'{tableName}.tmp.{fileFormat}')
+    if fileFormat == 'csv':
+        df.to_csv(filepathTmp, index=False, float_format=None)
+    else:
+        df.to_excel(filepathTmp, index=False, float_format=None)
+
+    os.replace(filepathTmp, filepath)
+    return filepath
@@ -0,0 +1,132 @@
+import multiprocessing
+import threading
+import dlib
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from app.helper.constant import COMPONENTS_SETUP, BLOCKSIZE
+from app.helper.poc import POC, POCSpectrum
+from app.helper.vektor import Vektor
+from app.helper.quadran import Quadran
+from app.helper.face import FaceTracker
+from app.helper.schema import FeatureMatrices, get_feature_schema
+from app.helper.preprocessing import extract_component_by_images
+
+def compute_component_features(referenceImage, referenceSpectrum, currentImage):
+    # POC -> Vektor -> Quadran untuk satu komponen terhadap ROI acuan
+    valPOC = POC(referenceImage, currentImage, BLOCKSIZE, spectrumCur=referenceSpectrum).getPOC()
+    quivData = Vektor(valPOC, BLOCKSIZE).getVektor()
+    initQuadran = Quadran(quivData)
+    return quivData, initQuadran, initQuadran.getQuadranColumns()
+
+def write_component_features(features: FeatureMatrices, featureRow, componentName, initQuadran, quadran):
+    # Tulis vektor per blok dan jumlah 4QMV satu komponen ke baris matriks fitur
+    vektorRow = features.getVektorRow(featureRow, componentName)
+    blockCount = min(len(quadran), len(vektorRow))
+    if blockCount != len(vektorRow):
+        print(f"[WARN] {componentName}: {len(quadran)} blocks extracted, schema expects {len(vektorRow)}.")
+
+    vektorRow[:blockCount, 0] = quadran['X'][:blockCount]
+    vektorRow[:blockCount, 1] = quadran['Y'][:blockCount]
+    vektorRow[:blockCount, 2] = quadran['tetha'][:blockCount]
+    vektorRow[:blockCount, 3] = quadran['magnitude'][:blockCount]
+
+    # Baris summary mengikuti FRAMES_DATA_QUADRAN_COMPONENTS, kolom mengikuti QUADRAN_DIMENSIONS
+    features.getQuadranRow(featureRow, componentName)[:] = initQuadran.getQuadranSummary(quadran).T
+
+def create_component_references(gray, shape):
+    # ROI acuan tiap komponen beserta spektrum POC-nya, dihitung sekali per video/sesi
+    references = {}
+    for componentName, componentInfo in COMPONENTS_SETUP.items():
+        referenceImage = extract_component_by_images(
+            image=gray,
+            shape=shape,
+            objectRectangle=componentInfo['object_rectangle'],
+            pixelShifting=componentInfo['pixel_shifting'],
+            objectDimension=componentInfo['object_dimension']
+        )
+        references[componentName] = (referenceImage, POCSpectrum(referenceImage, BLOCKSIZE))
+    return references
+
+def extract_frame_features(features: FeatureMatrices, featureRow, gray, shapes, references):
+    # Fitur semua komponen satu frame terhadap ROI acuan, ditulis ke baris featureRow
+    for shape in shapes:
+        for componentName, componentInfo in COMPONENTS_SETUP.items():
+            currentImage = extract_component_by_images(
+                image=gray,
+                shape=shape,
+                objectRectangle=componentInfo['object_rectangle'],
+                pixelShifting=componentInfo['pixel_shifting'],
+                objectDimension=componentInfo['object_dimension']
+            )
+
+            referenceImage, referenceSpectrum = references[componentName]
+            _, initQuadran, quadran = compute_component_features(referenceImage, referenceSpectrum, currentImage)
+            write_component_features(features, featureRow, componentName, initQuadran, quadran)
+
+# ==============================================================================
+# Worker process (ekstraksi paralel)
+# ==============================================================================
+
+_WORKER_STATE = {}
+
+def _init_worker(predictorPath, trackerOptions):
+    # Dijalankan sekali per worker: model dlib dimuat satu kali lalu dipakai untuk semua chunk
+    _WORKER_STATE['tracker'] = FaceTracker(
+        dlib.get_frontal_face_detector(),
+        dlib.shape_predictor(predictorPath),
+        **trackerOptions
+    )
+
+def extract_features_chunk(references, chunk):
+    """
+    Menghitung fitur untuk satu chunk frame (list of (row, gray)) terhadap ROI acuan.
+    references: {componentName: (referenceImage, referenceSpectrum)}.
+    Mengembalikan nomor baris beserta baris matriks fitur dan 4QMV-nya.
+    """
+    tracker = _WORKER_STATE['tracker']
+    # Chunk berikutnya belum tentu bersambung dengan chunk sebelumnya di worker ini
+    tracker.reset()
+
+    features = FeatureMatrices(get_feature_schema(), capacity=len(chunk))
+    for row, gray in chunk:
+        localRow = features.addFrame(row)
+        extract_frame_features(features, localRow, gray, tracker.getShapes(gray), references)
+
+    rows = len(features)
+    return np.array(features.frames), features.allFeatures[:rows], features.quadran[:rows]
+
+# ==============================================================================
+# Process pool (dipakai bersama oleh semua request)
+# ==============================================================================
+
+_POOL = {'executor': None, 'key': None}
+_POOL_LOCK = threading.Lock()
+
+def get_extraction_pool(workers, predictorPath, trackerOptions):
+    # Pool dibuat sekali dan hanya dibuat ulang jika konfigurasinya berubah
+    key = (workers, predictorPath, tuple(sorted(trackerOptions.items())))
+
+    with _POOL_LOCK:
+        if _POOL['executor'] is None or _POOL['key'] != key:
+            if _POOL['executor'] is not None:
+                _POOL['executor'].shutdown(wait=False)
+
+            # Proses ini sudah menjalankan beberapa thread pool (job, prediksi, BLAS/OpenCV), jadi worker
+            # tidak di-fork dari sini: fork bisa mewarisi lock yang sedang dipegang thread lain.
+            # forkserver mengimport modul ini sekali di proses server (single-thread) lalu fork dari sana,
+            # model dlib dimuat oleh _init_worker.
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context('forkserver')
+                context.set_forkserver_preload([__name__])
+            else:
+                context = multiprocessing.get_context('spawn')
+
+            _POOL['executor'] = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(predictorPath, trackerOptions)
+            )
+            _POOL['key'] = key
+
+        return _POOL['executor']
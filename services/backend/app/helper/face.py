@@ -0,0 +1,117 @@
+import cv2
+import dlib
+import numpy as np
+from typing import Literal
+
+class FaceTracker:
+    """
+    Deteksi wajah + landmark per frame.
+
+    mode 'full'     : detector HOG dijalankan di seluruh frame setiap kali (perilaku lama).
+    mode 'tracking' : detector seluruh frame hanya dijalankan pada frame pertama dan setiap
+                      detectionInterval frame. Di antaranya detector hanya dijalankan di ROI
+                      (bounding box landmark terakhir yang diperlebar roiMargin), dan kembali
+                      ke pencarian seluruh frame jika wajah hilang.
+
+    detectionScale memperkecil gambar sebelum detector HOG dijalankan (rectangle hasilnya
+    dikembalikan ke koordinat resolusi penuh), upsample menambah level pyramid dlib untuk
+    wajah kecil. Landmark tetap diprediksi dari frame resolusi penuh.
+    """
+    def __init__(
+        self,
+        detector,
+        predictor,
+        mode: Literal["full", "tracking"] = "tracking",
+        detectionInterval=10,
+        roiMargin=0.5,
+        detectionScale=1.0,
+        upsample=0
+    ):
+        self.detector = detector
+        self.predictor = predictor
+        self.mode = mode
+        self.detectionInterval = max(1, int(detectionInterval))
+        self.roiMargin = roiMargin
+        self.detectionScale = detectionScale
+        self.upsample = int(upsample)
+
+        self.lastShape = None
+        self.framesSinceDetection = 0
+
+    def reset(self):
+        # Lupakan wajah terakhir, frame berikutnya memakai deteksi seluruh frame
+        self.lastShape = None
+        self.framesSinceDetection = 0
+
+    def runDetector(self, gray):
+        if self.detectionScale == 1.0:
+            return list(self.detector(gray, self.upsample))
+
+        small = cv2.resize(gray, None, fx=self.detectionScale, fy=self.detectionScale, interpolation=cv2.INTER_AREA)
+
+        # Kembalikan rectangle ke koordinat resolusi penuh sebelum dipakai predictor
+        return [
+            dlib.rectangle(
+                int(round(rect.left() / self.detectionScale)),
+                int(round(rect.top() / self.detectionScale)),
+                int(round(rect.right() / self.detectionScale)),
+                int(round(rect.bottom() / self.detectionScale))
+            )
+            for rect in self.detector(small, self.upsample)
+        ]
+
+    def detectFull(self, gray):
+        return self.runDetector(gray)
+
+    def getRoi(self, gray):
+        # Bounding box landmark terakhir, diperlebar roiMargin di setiap sisi
+        points = np.array([[point.x, point.y] for point in self.lastShape.parts()])
+        x_left, y_top = points.min(axis=0)
+        x_right, y_bottom = points.max(axis=0)
+
+        margin_x = int((x_right - x_left) * self.roiMargin)
+        margin_y = int((y_bottom - y_top) * self.roiMargin)
+
+        # Memastikan koordinat tetap berada dalam batas size gambar
+        x_left = max(0, x_left - margin_x)
+        y_top = max(0, y_top - margin_y)
+        x_right = min(gray.shape[1], x_right + margin_x)
+        y_bottom = min(gray.shape[0], y_bottom + margin_y)
+        return int(x_left), int(y_top), int(x_right), int(y_bottom)
+
+    def detectInRoi(self, gray):
+        x_left, y_top, x_right, y_bottom = self.getRoi(gray)
+        if x_right <= x_left or y_bottom <= y_top:
+            return []
+
+        roi = np.ascontiguousarray(gray[y_top:y_bottom, x_left:x_right])
+
+        # Geser kembali koordinat rectangle ke koordinat frame penuh
+        return [
+            dlib.rectangle(rect.left() + x_left, rect.top() + y_top, rect.right() + x_left, rect.bottom() + y_top)
+            for rect in self.runDetector(roi)
+        ]
+
+    def getShapes(self, gray):
+        # Mode full: semua wajah yang terdeteksi diproses, sama seperti sebelumnya
+        if self.mode != "tracking":
+            return [self.predictor(gray, rect) for rect in self.detectFull(gray)]
+
+        rects = []
+        if self.lastShape is not None and self.framesSinceDetection < self.detectionInterval:
+            rects = self.detectInRoi(gray)
+            self.framesSinceDetection += 1
+
+        if not rects:
+            # Frame pertama, jadwal deteksi ulang, atau wajah hilang dari ROI
+            rects = self.detectFull(gray)
+            self.framesSinceDetection = 1
+
+        if not rects:
+            self.lastShape = None
+            return []
+
+        # Mode tracking hanya mengikuti satu wajah (yang terbesar)
+        rect = max(rects, key=lambda rect: rect.area())
+        self.lastShape = self.predictor(gray, rect)
+        return [self.lastShape]
@@ -1,6 +1,6 @@
 from collections import Counter
 import numpy as np
-import cv2, re
+import re
 
 def average(arr):
     unique, counts = np.unique(arr, return_counts=True)
@@ -29,27 +29,6 @@ def format_number_and_round(number, decimal_places=3):
     else:
         raise ValueError("Invalid number type")
     
-def convert_video_to_avi(input_path, output_path):
-    cap = cv2.VideoCapture(input_path)
-    fourcc = cv2.VideoWriter_fourcc(*'XVID')
-    out = None
-
-    if cap.isOpened():
-        frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        out = cv2.VideoWriter(output_path, fourcc, fps, (frame_width, frame_height))
-
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        out.write(frame)
-
-    cap.release()
-    if out is not None:
-        out.release()
-
 def get_calculate_from_predict(list_decoded_predictions):
     # Hitung jumlah kemunculan setiap kategori dalam array hasil prediksi
     prediction_counts = Counter(list_decoded_predictions)
@@ -81,9 +60,6 @@ def get_calculate_from_predict(list_decoded_predictions):
 
     return result_prediction, list_predictions
 
-def natural_sort_key(s):
-    return [int(text) if text.isdigit() else text.lower() for text in re.split('(\d+)', s)]
-
 def convert_ndarray_to_list(obj):
     if isinstance(obj, np.ndarray):
         print("satu")
@@ -0,0 +1,191 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+
+# Status job analisis video
+JOB_STATUS_QUEUED = 'queued'
+JOB_STATUS_RUNNING = 'running'
+JOB_STATUS_FINISHED = 'finished'
+JOB_STATUS_FAILED = 'failed'
+
+def is_process_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Proses ada, tapi milik user lain
+        return True
+    return True
+
+class JobStore:
+    """
+    Penyimpanan status dan hasil job di SQLite lokal (tanpa layanan luar).
+    Setiap operasi membuka koneksi sendiri, jadi aman dipakai dari banyak thread
+    dan dari beberapa proses. Setiap job mencatat PID proses pemiliknya dan waktu
+    heartbeat terakhir, dipakai recoverOrphaned() untuk menemukan job yang mati.
+    """
+    def __init__(self, databasePath):
+        self.databasePath = databasePath
+
+        with closing(self.connect()) as connection, connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    video_name TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner_pid INTEGER,
+                    heartbeat_at REAL
+                )
+            """)
+            # Database dari versi sebelumnya belum punya kolom pemilik job
+            columns = {row['name'] for row in connection.execute("PRAGMA table_info(jobs)")}
+            for column, columnType in [('owner_pid', 'INTEGER'), ('heartbeat_at', 'REAL')]:
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {columnType}")
+
+    def connect(self):
+        connection = sqlite3.connect(self.databasePath, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def create(self, jobId, videoName):
+        now = time.time()
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                "INSERT INTO jobs (id, status, video_name, created_at, updated_at, owner_pid, heartbeat_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (jobId, JOB_STATUS_QUEUED, videoName, now, now, os.getpid(), now)
+            )
+
+    def heartbeat(self, jobId):
+        # Tanda bahwa proses pemilik masih mengerjakan job ini (updated_at tidak diubah)
+        with closing(self.connect()) as connection, connection:
+            connection.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time(), jobId))
+
+    def recoverOrphaned(self, staleAfter):
+        """
+        Menandai gagal job queued/running yang proses pemiliknya sudah tidak ada,
+        atau yang heartbeat-nya lebih tua dari staleAfter detik (misalnya PID sudah
+        dipakai proses lain). Dipanggil sekali saat server start oleh proses yang
+        menjalankan job, bukan setiap kali modul di-import.
+        Mengembalikan daftar id job yang ditandai gagal.
+        """
+        now = time.time()
+        with closing(self.connect()) as connection, connection:
+            rows = connection.execute(
+                "SELECT id, owner_pid, heartbeat_at FROM jobs WHERE status IN (?, ?)",
+                (JOB_STATUS_QUEUED, JOB_STATUS_RUNNING)
+            ).fetchall()
+
+            orphaned = [
+                row['id'] for row in rows
+                if not is_process_alive(row['owner_pid']) or row['heartbeat_at'] is None or now - row['heartbeat_at'] > staleAfter
+            ]
+            connection.executemany(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                [(JOB_STATUS_FAILED, 'Interrupted: the server process running this job stopped', now, jobId) for jobId in orphaned]
+            )
+        return orphaned
+
+    def update(self, jobId, **fields):
+        if 'result' in fields and fields['result'] is not None:
+            fields['result'] = json.dumps(fields['result'])
+        fields['updated_at'] = time.time()
+
+        columns = ", ".join(f"{column} = ?" for column in fields)
+        with closing(self.connect()) as connection, connection:
+            connection.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), jobId))
+
+    def get(self, jobId):
+        with closing(self.connect()) as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (jobId,)).fetchone()
+
+        if row is None:
+            return None
+
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+class JobEvents:
+    """
+    Antrian event progress per job di memori, untuk dikirim lewat Server-Sent Events.
+    Setiap subscriber membaca dari awal, jadi client yang terlambat tetap menerima
+    semua event sebelumnya. Event job yang sudah selesai disimpan untuk maxClosedJobs terakhir.
+    """
+    def __init__(self, maxEventsPerJob=1000, maxClosedJobs=100):
+        self.maxEventsPerJob = maxEventsPerJob
+        self.maxClosedJobs = maxClosedJobs
+        self.condition = threading.Condition()
+        self.jobs = OrderedDict()
+
+    def open(self, jobId):
+        with self.condition:
+            self.jobs[jobId] = {'events': [], 'closed': False}
+
+    def publish(self, jobId, event, data, close=False):
+        with self.condition:
+            job = self.jobs.get(jobId)
+            if job is None or job['closed']:
+                return
+
+            # Event 'frames' terlalu sering: cukup simpan yang terbaru jika sudah penuh
+            if len(job['events']) >= self.maxEventsPerJob and job['events'][-1][0] == event:
+                job['events'][-1] = (event, data)
+            else:
+                job['events'].append((event, data))
+
+            if close:
+                job['closed'] = True
+                self.jobs.move_to_end(jobId)
+                closedJobs = [key for key, value in self.jobs.items() if value['closed']]
+                for key in closedJobs[:-self.maxClosedJobs]:
+                    del self.jobs[key]
+
+            self.condition.notify_all()
+
+    def has(self, jobId):
+        with self.condition:
+            return jobId in self.jobs
+
+    def subscribe(self, jobId, heartbeat=15):
+        """
+        Generator (event, data) sampai job selesai. Menghasilkan None setiap
+        heartbeat detik tanpa event baru, supaya koneksi tetap hidup.
+        """
+        position = 0
+        while True:
+            with self.condition:
+                job = self.jobs.get(jobId)
+                if job is None:
+                    return
+
+                if position >= len(job['events']) and not job['closed']:
+                    self.condition.wait(heartbeat)
+                    job = self.jobs.get(jobId)
+                    if job is None:
+                        return
+
+                events = job['events'][position:]
+                position = len(job['events'])
+                closed = job['closed']
+
+            if not events and not closed:
+                yield None
+
+            for item in events:
+                yield item
+
+            if closed and position >= len(job['events']):
+                return
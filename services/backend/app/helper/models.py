@@ -0,0 +1,215 @@
+import os
+import threading
+import time
+import warnings
+import numpy as np
+
+def load_joblib(filepath, mmapMode='r'):
+    # Array numpy di file joblib tanpa kompresi di-memory-map, file terkompresi dimuat biasa
+    # (joblib baru di-import saat model pertama dimuat)
+    import joblib
+
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', message='.*mmap_mode.*')
+        return joblib.load(filepath, mmap_mode=mmapMode or None)
+
+def get_process_rss():
+    # RSS proses sekarang (byte), None jika /proc tidak tersedia
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+def get_array_bytes(value, _seen=None, _depth=0):
+    """
+    Total ukuran array numpy di dalam sebuah objek (atribut, list, dict).
+    Mengembalikan (byte di memori, byte memory-mapped).
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen or _depth > 6:
+        return 0, 0
+    seen.add(id(value))
+
+    if isinstance(value, np.memmap) or (isinstance(value, np.ndarray) and isinstance(value.base, np.memmap)):
+        return 0, value.nbytes
+    if isinstance(value, np.ndarray):
+        return value.nbytes, 0
+
+    if isinstance(value, dict):
+        children = value.values()
+    elif isinstance(value, (list, tuple, set)):
+        children = value
+    elif hasattr(value, '__dict__') and not isinstance(value, type):
+        children = vars(value).values()
+    else:
+        return 0, 0
+
+    inMemory, mapped = 0, 0
+    for child in children:
+        childMemory, childMapped = get_array_bytes(child, seen, _depth + 1)
+        inMemory += childMemory
+        mapped += childMapped
+    return inMemory, mapped
+
+class ModelArtifact:
+    """
+    Satu file model di folder models. Dimuat saat pertama kali dipakai dan
+    dimuat ulang jika ukuran/waktu modifikasi/inode file berubah. Artifact
+    optional boleh tidak ada filenya (tanpa error).
+    """
+    def __init__(self, name, filepath, loader, mmapMode=None, optional=False):
+        self.name = name
+        self.filepath = filepath
+        self.loader = loader
+        self.mmapMode = mmapMode
+        self.optional = optional
+        self.value = None
+        # Belum pernah dicek (None berarti file tidak ada)
+        self.signature = False
+        self.loaded = False
+        self.lock = threading.Lock()
+        self.lastCheck = 0.0
+
+        self.loadTime = None
+        self.loadedAt = None
+        self.memoryBytes = None
+        self.mmapBytes = None
+        self.rssDeltaBytes = None
+        self.reloads = 0
+        self.error = None
+
+    def getSignature(self):
+        if self.filepath is None:
+            return 'static'
+        try:
+            stat = os.stat(self.filepath)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+    def load(self, signature):
+        if signature is None:
+            # Versi yang sudah dimuat (jika ada) tetap dipakai sampai file muncul lagi
+            self.signature = None
+            if self.optional:
+                return
+            self.error = f"Model file not found: {self.filepath}"
+            print(f"[ERROR] {self.error}")
+            return
+
+        mmapMode = self.mmapMode
+        if mmapMode and self.signature and signature[2] == self.signature[2]:
+            # File ditimpa di tempat (inode sama): halaman versi lama yang di-memory-map ikut
+            # berubah. Versi baru dimuat sebagai salinan privat agar tidak terulang.
+            print(f"[WARN] Model file {self.filepath} was overwritten in place; replace model files "
+                  f"with an atomic rename instead. Loading a private copy.")
+            mmapMode = None
+
+        rssBefore = get_process_rss()
+        startTime = time.perf_counter()
+        try:
+            value = self.loader(self.filepath, mmapMode)
+        except Exception as e:
+            # Model lama tetap dipakai, misalnya saat file baru masih ditulis
+            self.error = str(e)
+            print(f"[ERROR] Failed to load model {self.name}: {e}")
+            return
+
+        self.loadTime = time.perf_counter() - startTime
+        rssAfter = get_process_rss()
+        self.rssDeltaBytes = rssAfter - rssBefore if rssBefore is not None and rssAfter is not None else None
+        self.memoryBytes, self.mmapBytes = get_array_bytes(value)
+
+        if self.loaded:
+            self.reloads += 1
+            print(f"[INFO] Model {self.name} reloaded in {self.loadTime:.3f}s.")
+
+        # Referensi diganti sekaligus: request yang sedang berjalan tetap memakai objek lama
+        self.value = value
+        self.signature = signature
+        self.loaded = True
+        self.loadedAt = time.time()
+        self.error = None
+
+    def toDict(self):
+        return {
+            "name": self.name,
+            "file": os.path.basename(self.filepath) if self.filepath else None,
+            "optional": self.optional,
+            "loaded": self.loaded,
+            "load_time_seconds": round(self.loadTime, 4) if self.loadTime is not None else None,
+            "memory_bytes": self.memoryBytes,
+            "mmap_bytes": self.mmapBytes,
+            "rss_delta_bytes": self.rssDeltaBytes,
+            "loaded_at": self.loadedAt,
+            "reloads": self.reloads,
+            "error": self.error,
+        }
+
+class ModelRegistry:
+    """
+    Pengganti model global yang dimuat saat import. Setiap artifact dimuat saat
+    get() pertama kali; perubahan file dicek paling sering setiap checkInterval
+    detik. Saat dimuat ulang, pemanggil lain tetap menerima versi lama sampai
+    versi baru siap.
+
+    Dengan mmapMode, file model harus diganti lewat rename atomik (tulis ke file
+    sementara di folder yang sama lalu os.replace / mv) agar versi yang sedang
+    di-memory-map tetap utuh. Menimpa file di tempat bisa merusak request yang
+    sedang berjalan (atau SIGBUS jika file mengecil); hal ini dideteksi dari inode
+    yang sama dan versi barunya dimuat tanpa memory-map.
+    """
+    def __init__(self, directory, mmapMode='r', checkInterval=2.0):
+        self.directory = directory
+        self.mmapMode = mmapMode
+        self.checkInterval = checkInterval
+        self.artifacts = {}
+
+    def register(self, name, filename=None, loader=None, optional=False):
+        # Tanpa loader: file joblib; filename None untuk objek yang tidak berasal dari file.
+        # loader(path, mmapMode) dengan mmapMode None jika file harus dimuat sebagai salinan privat
+        filepath = os.path.join(self.directory, filename) if filename else None
+        if loader is None:
+            loader = load_joblib
+        self.artifacts[name] = ModelArtifact(name, filepath, loader, self.mmapMode, optional)
+
+    def getPath(self, name):
+        return self.artifacts[name].filepath
+
+    def get(self, name):
+        artifact = self.artifacts[name]
+
+        now = time.monotonic()
+        if artifact.loaded and now - artifact.lastCheck < self.checkInterval:
+            return artifact.value
+
+        # Sudah pernah dimuat: jangan menunggu thread lain yang sedang memuat ulang
+        if not artifact.lock.acquire(blocking=not artifact.loaded):
+            return artifact.value
+
+        try:
+            if not artifact.loaded or time.monotonic() - artifact.lastCheck >= self.checkInterval:
+                signature = artifact.getSignature()
+                if signature != artifact.signature:
+                    artifact.load(signature)
+                artifact.lastCheck = time.monotonic()
+        finally:
+            artifact.lock.release()
+
+        return artifact.value
+
+    def loadAll(self):
+        for name in self.artifacts:
+            self.get(name)
+
+    def report(self):
+        artifacts = [artifact.toDict() for artifact in self.artifacts.values()]
+        return {
+            "artifacts": artifacts,
+            "loaded": sum(1 for artifact in artifacts if artifact['loaded']),
+            "total_load_time_seconds": round(sum(artifact['load_time_seconds'] or 0 for artifact in artifacts), 4),
+            "total_memory_bytes": sum(artifact['memory_bytes'] or 0 for artifact in artifacts),
+            "total_mmap_bytes": sum(artifact['mmap_bytes'] or 0 for artifact in artifacts),
+            "process_rss_bytes": get_process_rss(),
+        }
@@ -1,12 +1,13 @@
 import numpy as np 
+from numpy.lib.stride_tricks import as_strided
 from scipy.fftpack import fft2, ifft2, fftshift # Fast Fourier Transform 2D -> mengubah domain spesial (gambar) menjadi domain frekuensi
-import matplotlib.pyplot as plt 
 
 class POC:
-    def __init__(self, imgBlockCur, imgBlockRef, blockSize):
+    def __init__(self, imgBlockCur, imgBlockRef, blockSize, spectrumCur=None):
         self.imgBlockCur = imgBlockCur # Gambar saat ini (grayscale)
         self.imgBlockRef = imgBlockRef # gambar referensi yg dibandingkan
         self.blockSize = blockSize # ukuran blok perbandingan 7x7
+        self.spectrumCur = spectrumCur # POCSpectrum dari imgBlockCur (opsional, cache)
 
     def hannCalc(self):
         window = np.hanning(self.blockSize) # menghasilkan hanning window 2D untuk menghaluskan tepi blok sebelum transformasi fourier, menghindari efek tepi
@@ -35,6 +36,66 @@ class POC:
         return r
 
 
+    def applyWindow(self, blocks, window):
+        # Sama dengan np.dot(block, window) per blok, tapi untuk semua blok sekaligus
+        if np.ndim(window) == 2:
+            return np.matmul(blocks, window)
+        return blocks * window
+
+    def getBlocks(self, img):
+        # View (jumlah blok Y, jumlah blok X, mb_y, mb_x) atas gambar tanpa copy data.
+        # Sisa pixel di tepi kanan/bawah yang tidak genap satu blok diabaikan.
+        mb = self.blockSize
+        strideY, strideX = img.strides
+        return as_strided(
+            img,
+            shape=(img.shape[0] // mb, img.shape[1] // mb, mb, mb),
+            strides=(strideY * mb, strideX * mb, strideY, strideX),
+            writeable=False
+        )
+
+    def matchShape(self, img, shape):
+        # Samakan ukuran gambar dengan gambar acuan. Bagian yang kurang diisi nol,
+        # sama seperti zero padding fft2(block, (mb_x, mb_y)) pada blok yang terpotong.
+        if img.shape == shape:
+            return img
+        matched = np.zeros(shape, dtype=img.dtype)
+        height = min(shape[0], img.shape[0])
+        width = min(shape[1], img.shape[1])
+        matched[:height, :width] = img[:height, :width]
+        return matched
+
+    def calcSpectrum(self, blocks, window):
+        # FFT 2D semua blok sekaligus pada dua axis terakhir
+        return fft2(self.applyWindow(blocks, window), axes=(-2, -1))
+
+    def calcBatchCorrelation(self, fft_ref, fft_curr_conj):
+        # Versi batch dari calcPOC setelah FFT: cross-power spectrum ternormalisasi,
+        # inverse FFT dan fftshift untuk semua blok sekaligus
+        R1  = fft_ref * fft_curr_conj
+        R2  = abs(R1)
+        R2[R2 == 0] = 1e-31
+        R   = R1/R2
+        r   = abs(ifft2(R, axes=(-2, -1)))
+        return fftshift(r, axes=(-2, -1))
+
+    def calcBatchPOC(self, blocksRef, blocksCurr, window):
+        fft_ref  = self.calcSpectrum(blocksRef, window)
+        fft_curr = self.calcSpectrum(blocksCurr, window)
+        return self.calcBatchCorrelation(fft_ref, np.conj(fft_curr))
+
+    def getBlockCoordinates(self, colsY, rowsX):
+        mb_x = self.blockSize
+        mb_y = self.blockSize
+
+        nY, nX = np.meshgrid(np.arange(colsY), np.arange(rowsX), indexing='ij')
+        nY = nY.ravel().astype(float)
+        nX = nX.ravel().astype(float)
+
+        coorAwal = np.column_stack(((nX + 1) * mb_x, (nY + 1) * mb_y))  # koordinat X, Y mulai
+        rect = np.column_stack((nX * mb_x, nY * mb_y, np.full_like(nX, mb_x), np.full_like(nY, mb_y)))  # x y width height
+        return coorAwal, rect
+
     def getPOC(self):
         mb_x = self.blockSize  # panjang macroblock
         mb_y = self.blockSize  # lebar macroblock
@@ -42,67 +103,46 @@ class POC:
         # Perhitunggan Hanning Window
         window = self.hannCalc()
 
-        img0 = self.imgBlockCur
-        img1 = self.imgBlockRef
-
-        # konversi image float ke int
-        cols, rows = img0.shape
-        img0 = img0.astype(int)
-        img1 = img1.astype(int)
-
-        # menghitung berapa blok yang dihasilkan
-        # dengan pembagian width atau height dan dibagi dengan blocksize
-        colsY = np.int16(np.floor(cols / mb_y))
-        rowsX = np.int16(np.floor(rows / mb_x))
-
-        # inisiasi untuk menyimpan matrik image yang dipecah dalam blok
-        BlocksCurr = np.empty((colsY, rowsX), dtype=object)
-        BlocksRef = np.empty((colsY, rowsX), dtype=object)
-
-        # untuk mengetahui sisa pixel
-        modY = cols % mb_y
-        modX = rows % mb_x
-
-        # inisiasi untuk menyimpan nilai poc
-        poc = np.zeros((mb_y, mb_x, colsY * rowsX))
-        coorAwal = np.zeros((colsY * rowsX,2))
-        rect = np.zeros((colsY * rowsX,4))
-
-        nm = 0
-        nY = 0
-        nYY =1
-
-        # perulangan y dan x dimulai dari 1
-        # perulangan ini akan loncat sesuai dengan blocksize yang ditentukan
-        # fungsi cols-modY atau rows-modX untuk pembatas, supaya area perulangan tidak melampaui ukuran gambar
-        for y in range(0, cols - modY, mb_y):
-            nX = 0
-            nXX = 1
-            for x in range(0, rows - modX, mb_x):
-            # ambil blok gambar dan simpan
-                # untuk menyimpan block array yang di crop sesuai ukuran
-                BlocksCurr[nY, nX] = img0[y:y+mb_y, x: x+mb_x]
-                BlocksRef[nY, nX]  = img1[y:y+mb_y, x: x+mb_x]
-
-                rect[nm, :] = [x, y, mb_x, mb_y] #untuk membentuk kotak setiap blok
-
-                block_ref = BlocksRef[nY, nX]
-                block_curr = BlocksCurr[nY, nX]
-
-                # Perhitungan POC 
-                r = self.calcPOC(block_ref, block_curr, window, mb_x, mb_y)
-                # menyimpan nilai poc sesuai nomor blok
-                poc[:, :, nm] = r # hasil korelasi tiap blok
-
-                coorAwal[nm, 0] = nXX * mb_x  # koordinat X mulai
-                coorAwal[nm, 1] = nYY * mb_y  # koordinat Y mulai
-                nX  += 1
-                nXX += 1
-                nm  += 1
-            nY  += 1
-            nYY += 1
+        if self.spectrumCur is None:
+            self.spectrumCur = POCSpectrum(self.imgBlockCur, self.blockSize)
+        spectrumCur = self.spectrumCur
+
+        # konversi image float ke int, samakan ukuran dengan gambar acuan
+        img1 = self.matchShape(self.imgBlockRef.astype(int), spectrumCur.shape)
+
+        # pecah gambar menjadi blok (view tanpa copy), urutan blok baris per baris
+        BlocksRef = self.getBlocks(img1)
+        colsY, rowsX = spectrumCur.colsY, spectrumCur.rowsX
+
+        # Perhitungan POC seluruh blok sekaligus, spektrum imgBlockCur diambil dari cache
+        r = self.calcBatchCorrelation(self.calcSpectrum(BlocksRef, window), spectrumCur.spectrumConj)
+
+        # menyimpan nilai poc sesuai nomor blok -> (mb_y, mb_x, jumlah blok)
+        poc = np.ascontiguousarray(r.reshape(colsY * rowsX, mb_y, mb_x).transpose(1, 2, 0))
+
         # kembalian nilai
         # poc : untuk penyimpanan nilai poc disetiap blok
         # coorAwal : sebagai koordinat awal penanda batas blok
         # rect : untuk menyimpak penanda kotak x y width height / bounding box
-        return [poc, coorAwal, rect]
+        return [poc, spectrumCur.coorAwal, spectrumCur.rect]
+
+class POCSpectrum:
+    """
+    Cache spektrum gambar acuan (imgBlockCur pada POC): blok, window, FFT dan
+    konjugatnya dihitung sekali, lalu dipakai ulang untuk setiap frame berikutnya.
+    """
+    def __init__(self, imgBlock, blockSize):
+        poc = POC(imgBlock, imgBlock, blockSize)
+        img = np.asarray(imgBlock).astype(int)
+        blocks = poc.getBlocks(img)
+
+        self.blockSize = blockSize
+        self.shape = img.shape
+        self.colsY, self.rowsX = blocks.shape[:2]
+        self.spectrumConj = np.conj(poc.calcSpectrum(blocks, poc.hannCalc()))
+        self.coorAwal, self.rect = poc.getBlockCoordinates(self.colsY, self.rowsX)
+
+        # Dipakai bersama oleh semua frame, jadi dibuat read-only
+        self.spectrumConj.setflags(write=False)
+        self.coorAwal.setflags(write=False)
+        self.rect.setflags(write=False)
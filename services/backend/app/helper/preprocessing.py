@@ -1,10 +1,8 @@
-import cv2, os
+import cv2, os, threading
 from flask import url_for
 from app import app
-import matplotlib.pyplot as plt
 import numpy as np
 from typing import Literal, TypedDict
-import moviepy.editor as mp
 
 class ObjectRectangle(TypedDict):
     x_right: int
@@ -20,36 +18,23 @@ class ObjectDimension(TypedDict):
     width: int
     height: int
 
-def extract_component_by_images(
-    image,
+# pyplot memakai state global, renderer matplotlib (PREVIEW_RENDERER = 'matplotlib') dijalankan bergantian
+PLOTLIB_LOCK = threading.Lock()
+
+def get_url_static_file(filepath):
+    with app.app_context():
+        return url_for('static', filename=filepath.replace('\\', '/').replace('assets/', '', 1), _external=True)
+
+def get_component_rectangle(
+    imageShape,
     shape,
-    frameName,
-    objectName: Literal[
-        "mouth",
-        "eyebrows",
-    ],
     objectRectangle: ObjectRectangle,
     pixelShifting: PixelShifting,
-    objectDimension: ObjectDimension,
-    directoryOutputImage,
-    withPreview = False
+    objectDimension: ObjectDimension
 ):
-    # withPreview = True
     # Setup shape part dari parameter objectRectangle
-    x_right = shape.part(objectRectangle["x_right"]).x
     x_left = shape.part(objectRectangle["x_left"]).x
     y_highest = shape.part(objectRectangle["y_highest"]).y
-    y_lowest = shape.part(objectRectangle["y_lowest"]).y
-
-    # print(f'objectName = {objectName}' )
-    # print(f'objectRectangle = {objectRectangle}' )
-    # print(f'pixelShifting = {pixelShifting}' )
-    # print(f'objectDimension = {objectDimension}' )
-    # print(f'x_left = {x_left}' )
-    # print(f'x_right = {x_right}' )
-
-    width_object = x_right - x_left
-    height_object = y_lowest - y_highest
 
     # Menggeser tepi kiri sisi gambar sebanyak variabel pergeseran_pixel ke kiri
     x_left -= pixelShifting["pixel_x"]
@@ -59,91 +44,171 @@ def extract_component_by_images(
     # Memastikan koordinat tetap berada dalam batas size gambar
     x_left = max(0, x_left)
     y_highest = max(0, y_highest)
-    width_object = min(objectDimension["width"], image.shape[1] - x_left)
-    height_object = min(objectDimension["height"], image.shape[0] - y_highest)
+    width_object = min(objectDimension["width"], imageShape[1] - x_left)
+    height_object = min(objectDimension["height"], imageShape[0] - y_highest)
 
-    if withPreview:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.join(directoryOutputImage, objectName), exist_ok=True)
+    return x_left, y_highest, width_object, height_object
 
-    selected_component_image = image.copy()
+def extract_component_by_images(
+    image,
+    shape,
+    objectRectangle: ObjectRectangle,
+    pixelShifting: PixelShifting,
+    objectDimension: ObjectDimension
+):
+    # ROI grayscale satu komponen (gambar preview dibuat terpisah, lihat app/helper/preview.py)
+    x_left, y_highest, width_object, height_object = get_component_rectangle(
+        image.shape, shape, objectRectangle, pixelShifting, objectDimension
+    )
 
-    selected_component_image = image.copy()[y_highest:y_highest + height_object + 1, x_left:x_left + width_object + 1]
+    # Crop cukup dari view, tanpa menyalin seluruh frame
+    selected_component_image = image[y_highest:y_highest + height_object + 1, x_left:x_left + width_object + 1]
 
-    # Grayscale the image
-    selected_component_image_gray = cv2.cvtColor(
-        selected_component_image, cv2.COLOR_BGR2GRAY
-    )
-    
-    if withPreview:
-        filepath = os.path.join(directoryOutputImage, objectName, f"{frameName:02}.jpg")
+    # Grayscale the image (frame yang sudah grayscale cukup disalin)
+    if selected_component_image.ndim == 3:
+        selected_component_image_gray = cv2.cvtColor(
+            selected_component_image, cv2.COLOR_BGR2GRAY
+        )
+    else:
+        selected_component_image_gray = selected_component_image.copy()
 
-    image_url = None
-    if withPreview and cv2.imwrite(filepath, selected_component_image_gray):
-        with app.app_context():
-            # Dapatkan URL dari gambar yang disimpan
-            image_url = url_for('static', filename=filepath.replace('\\', '/').replace('assets/', '', 1), _external=True)
+    return np.array(selected_component_image_gray)
 
-    return np.array(selected_component_image_gray), image_url
+def get_frame_sampling_stride(videoFps, targetFps=None, stride=None):
+    # Stride eksplisit selalu didahulukan
+    if stride:
+        return max(1, int(stride))
 
-def get_frames_by_input_video(pathInputVideo, pathOutputImage, framePerSecond=60):
-    images = []  # Array untuk menyimpan informasi gambar
-    error = None  # Variabel untuk menyimpan pesan kesalahan
-    
+    # Tanpa target fps (atau fps container tidak valid) semua frame diambil
+    if not targetFps or not videoFps or videoFps <= 0:
+        return 1
+
+    return max(1, int(round(videoFps / targetFps)))
+
+def get_sampled_frame_count(pathInputVideo, targetFps=None, stride=None, maxFrames=None):
+    # Perkiraan jumlah frame yang akan diambil (None jika container tidak menyimpan jumlah frame)
+    # maxFrames None atau 0 berarti tanpa batas
+    maxFrames = maxFrames or None
+    vidcap = cv2.VideoCapture(f'{pathInputVideo}')
+    frameCount = int(vidcap.get(cv2.CAP_PROP_FRAME_COUNT))
+    frameStride = get_frame_sampling_stride(vidcap.get(cv2.CAP_PROP_FPS), targetFps, stride)
+    vidcap.release()
+
+    if frameCount <= 0:
+        return maxFrames
+
+    sampledCount = (frameCount + frameStride - 1) // frameStride
+    return sampledCount if maxFrames is None else min(sampledCount, maxFrames)
+
+def get_frames_stream_by_input_video(pathInputVideo, targetFps=None, stride=None, maxFrames=None):
+    """
+    Membaca frame video secara streaming: frame hasil decode langsung
+    diberikan lewat generator (frameName, image) tanpa ditulis ke disk dulu.
+
+    Video di-decode berurutan dengan grab(), dan hanya frame ke-n (sesuai stride
+    atau targetFps) yang di-retrieve. maxFrames membatasi jumlah frame yang diambil
+    (None atau 0 = tanpa batas).
+    Nama frame mengikuti nomor frame asli di video (img1, img2, ...).
+    """
     # Cek apakah file video terdeteksi
     if not os.path.exists(pathInputVideo):
-        error = f"Path to file {pathInputVideo} is not valid"
-        return images, error
+        return None, f"Path to file {pathInputVideo} is not valid"
 
     # Convert path video ke video capture
     vidcap = cv2.VideoCapture(f'{pathInputVideo}')
     if not vidcap.isOpened():
-        error = f"Failed to open video {pathInputVideo}"
-        return images, error
-
-    # Buat path directory untuk output gambar jika tidak ada
-    if not os.path.exists(pathOutputImage):
-        os.makedirs(pathOutputImage)
-
-    count = 1
-    # Ambil frame rate dari video
-    # framePerSecond = 200
-    framePerSecond = vidcap.get(cv2.CAP_PROP_FPS)
-
-    while True:
-        # Read setiap frame dari video (setiap looping framenya bertambah 1 sampai jumlah frame video habis baru success bernilai false)
-        success, image = vidcap.read()
-        if not success:
-            break
-
-        # Buat nama file gambar
-        filename = f"img{count}.jpg"
-        filepath = os.path.join(pathOutputImage, filename)
-
-        # Simpan gambar sebagai jpg
-        if cv2.imwrite(filepath, image):
-            with app.app_context():
-                # Dapatkan URL dari gambar yang disimpan
-
-                image_url = url_for('static', filename=filepath.replace('\\', '/').replace('assets/', '', 1), _external=True)
-                images.append({
-                    'name': f"img{count}",
-                    'url': image_url
-                })
-
-        # count ++ untuk melanjutkan looping ke frame berikutnya
-        count += 1
-        
-        # Hitung waktu diambilnya frame ke sekian detik dari durasi video 
-        expected_frame_time = count / framePerSecond
-        
-        # Set waktu frame yang diambil 
-        vidcap.set(cv2.CAP_PROP_POS_MSEC, expected_frame_time * 1000)
-
-    # Jangan lupa untuk merilis capture object
-    vidcap.release()
-    
-    return images, error
+        return None, f"Failed to open video {pathInputVideo}"
+
+    frameStride = get_frame_sampling_stride(vidcap.get(cv2.CAP_PROP_FPS), targetFps, stride)
+    maxFrames = maxFrames or None
+
+    def frames():
+        count = 0
+        taken = 0
+        try:
+            while maxFrames is None or taken < maxFrames:
+                # grab() hanya demux + decode, tanpa konversi ke BGR
+                if not vidcap.grab():
+                    break
+
+                count += 1
+                if (count - 1) % frameStride != 0:
+                    continue
+
+                success, image = vidcap.retrieve()
+                if not success:
+                    break
+
+                taken += 1
+                yield f"img{count}", image
+        finally:
+            # Capture tetap dirilis walaupun generator tidak dihabiskan
+            vidcap.release()
+
+    return frames(), None
+
+# Warna panah (BGR) sama dengan color="g" pada versi matplotlib
+QUIVER_COLOR = (0, 128, 0)
+
+def draw_quiver_image(dataBlockImage, quivData, scale=6):
+    """
+    Menggambar vektor gerak (x, y, u, v) di atas ROI grayscale dengan cv2.arrowedLine.
+    ROI diperbesar scale kali (nearest neighbour) supaya panah tetap terlihat.
+    Tidak memakai state global, jadi aman dipanggil dari banyak thread.
+    """
+    # Kontras dinormalisasi min-max seperti imshow(cmap="gray") pada matplotlib
+    image = cv2.normalize(np.uint8(dataBlockImage), None, 0, 255, cv2.NORM_MINMAX)
+    image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_NEAREST)
+    image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    thickness = max(1, scale // 3)
+
+    # Blok yang tidak bergerak bernilai 0 semua dan tidak digambar
+    vectors = np.asarray(quivData[:, :4], dtype=np.float64)
+    vectors = vectors[(vectors[:, 2] != 0) | (vectors[:, 3] != 0)]
+
+    for x, y, u, v in vectors:
+        start = (int(round(x * scale)), int(round(y * scale)))
+        end = (int(round((x + u) * scale)), int(round((y + v) * scale)))
+        cv2.arrowedLine(image, start, end, QUIVER_COLOR, thickness=thickness, line_type=cv2.LINE_AA, tipLength=0.3)
+
+    return image
+
+def draw_quiver_and_save_opencv_image(
+    dataBlockImage,
+    quivData,
+    frameName,
+    objectName: Literal[
+        "mouth",
+        "eyebrows",
+    ],
+    directoryOutputImage,
+    scale=6
+):
+    image = draw_quiver_image(dataBlockImage, quivData, scale=scale)
+    filepath = os.path.join(directoryOutputImage, objectName, f"{frameName}-quiver.jpg")
+
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    cv2.imwrite(filepath, image)
+    return get_url_static_file(filepath)
+
+def draw_quiver_and_save_image(
+    dataBlockImage,
+    quivData,
+    frameName,
+    objectName: Literal[
+        "mouth",
+        "eyebrows",
+    ],
+    directoryOutputImage
+):
+    # Renderer preview sesuai PREVIEW_RENDERER: 'opencv' (default) atau 'matplotlib'
+    if app.config['PREVIEW_RENDERER'] == 'matplotlib':
+        return draw_quiver_and_save_plotlib_image(dataBlockImage, quivData, frameName, objectName, directoryOutputImage)
+
+    return draw_quiver_and_save_opencv_image(
+        dataBlockImage, quivData, frameName, objectName, directoryOutputImage,
+        scale=app.config['PREVIEW_QUIVER_SCALE']
+    )
 
 def draw_quiver_and_save_plotlib_image(
     dataBlockImage, 
@@ -171,6 +236,13 @@ def draw_quiver_and_save_plotlib_image(
     # # Hapus plot untuk menghindari konflik dengan plot berikutnya
     # plt.clf()
 
+    # matplotlib hanya di-import jika renderer ini benar-benar dipakai
+    import matplotlib.pyplot as plt
+
+    with PLOTLIB_LOCK:
+        return _draw_quiver_with_plotlib(plt, dataBlockImage, quivData, frameName, objectName, directoryOutputImage)
+
+def _draw_quiver_with_plotlib(plt, dataBlockImage, quivData, frameName, objectName, directoryOutputImage):
     # Plot the image
     plt.imshow(np.uint8(dataBlockImage), cmap="gray")
     
@@ -203,6 +275,9 @@ def draw_quiver_and_save_plotlib_image(
     return image_url
 
 def convert_video_to_webm(input_path, output_path):
+    # moviepy berat untuk di-import (ikut memuat matplotlib/IPython), jadi baru di-import di sini
+    import moviepy.editor as mp
+
     # Menggunakan moviepy untuk konversi video ke WEBM
     clip = mp.VideoFileClip(input_path)
     clip.write_videofile(output_path, codec='libvpx', audio_codec='libvorbis')
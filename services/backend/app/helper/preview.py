@@ -0,0 +1,82 @@
+import os
+import cv2
+import numpy as np
+from app.helper.constant import COMPONENTS_SETUP
+
+# Nama file data preview di dalam folder output gambar setiap video
+PREVIEW_MANIFEST_FILENAME = 'preview.npz'
+
+class PreviewRecorder:
+    """
+    Data ringkas untuk preview yang dibuat belakangan (lazy): nomor frame di video,
+    koordinat ROI (x_left, y_highest, width, height) dan vektor gerak (x, y, u, v)
+    setiap komponen. Gambar baru digambar saat URL preview pertama kali dibuka.
+    """
+    def __init__(self, blockCounts):
+        self.blockCounts = dict(blockCounts)
+        self.frameNames = []
+        self.rects = {componentName: [] for componentName in self.blockCounts}
+        self.vectors = {componentName: [] for componentName in self.blockCounts}
+
+    def addFrame(self, frameName):
+        # ROI -1 = wajah tidak terdeteksi, vektor NaN = frame acuan (tanpa POC)
+        self.frameNames.append(frameName)
+        for componentName, blockCount in self.blockCounts.items():
+            self.rects[componentName].append(np.full(4, -1, dtype=np.int32))
+            self.vectors[componentName].append(np.full((blockCount, 4), np.nan))
+
+    def setComponent(self, componentName, rect, quivData=None):
+        self.rects[componentName][-1][:] = rect
+        if quivData is not None:
+            blockCount = min(len(quivData), self.blockCounts[componentName])
+            self.vectors[componentName][-1][:blockCount] = quivData[:blockCount, :4]
+
+    def save(self, directory, pathInputVideo):
+        os.makedirs(directory, exist_ok=True)
+        arrays = {'frames': np.array(self.frameNames, dtype=str), 'video': np.array(pathInputVideo)}
+        for componentName in self.blockCounts:
+            arrays[f'{componentName}_rects'] = np.array(self.rects[componentName], dtype=np.int32).reshape(-1, 4)
+            arrays[f'{componentName}_vectors'] = np.array(self.vectors[componentName]).reshape(len(self.frameNames), -1, 4)
+
+        filepath = os.path.join(directory, PREVIEW_MANIFEST_FILENAME)
+        np.savez_compressed(filepath, **arrays)
+        return filepath
+
+def load_preview_manifest(directory):
+    # None jika video ini tidak diproses dengan preview
+    filepath = os.path.join(directory, PREVIEW_MANIFEST_FILENAME)
+    if not os.path.exists(filepath):
+        return None
+
+    with np.load(filepath, allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
+
+def get_component_by_object_name(objectName):
+    # Folder preview memakai object_name ('mouth', 'eyebrows'), manifest memakai nama komponen
+    return next((componentName for componentName, info in COMPONENTS_SETUP.items() if info['object_name'] == objectName), None)
+
+def read_video_frame(pathInputVideo, frameName):
+    """
+    Membaca satu frame berdasarkan nama frame (img1, img2, ... = nomor frame asli).
+    Langsung seek ke frame tersebut (backend FFmpeg OpenCV decode dari keyframe
+    sebelumnya, hasilnya sama dengan frame saat ekstraksi), sehingga preview frame
+    ke-N tidak perlu decode N frame. Jika container tidak bisa di-seek, frame
+    di-grab berurutan seperti get_frames_stream_by_input_video.
+    """
+    frameNumber = int(frameName.replace('img', ''))
+    vidcap = cv2.VideoCapture(f'{pathInputVideo}')
+    try:
+        if frameNumber > 1 and not vidcap.set(cv2.CAP_PROP_POS_FRAMES, frameNumber - 1):
+            for _ in range(frameNumber - 1):
+                if not vidcap.grab():
+                    return None
+
+        success, image = vidcap.read()
+        return image if success else None
+    finally:
+        vidcap.release()
+
+def crop_component(image, rect):
+    # Sama dengan crop di extract_component_by_images (ukuran ROI = dimensi + 1 pixel)
+    x_left, y_highest, width, height = (int(value) for value in rect)
+    return cv2.cvtColor(image[y_highest:y_highest + height + 1, x_left:x_left + width + 1], cv2.COLOR_BGR2GRAY)
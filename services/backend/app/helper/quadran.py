@@ -1,55 +1,77 @@
 import numpy as np
 from app.helper.helper import format_number_and_round_numpy
 
+# Kode quadran numerik: 0 = tidak ada quadran (X = Y = 0), 1..4 = Q1..Q4
+QUADRAN_NONE = 0
+QUADRAN_LABELS = {1: "Q1", 2: "Q2", 3: "Q3", 4: "Q4"}
+
+QUADRAN_DTYPE = np.dtype([
+    ('index', np.int64),
+    ('X', np.int64),
+    ('Y', np.int64),
+    ('tetha', np.float64),
+    ('magnitude', np.float64),
+    ('quadran', np.int8),
+])
+
 class Quadran:
     def __init__(self, coorData):
         self.dataA = coorData[:, 4]
         self.dataB = coorData[:, 5]
 
-    def getQuadran(self):
-        quadranData = np.empty((len(self.dataA), 6), dtype=object)
+    def getQuadranColumns(self):
+        # Versi vektor dari getQuadran, hasilnya structured array bertipe QUADRAN_DTYPE
+        X = self.dataA.astype(np.int_)
+        Y = self.dataB.astype(np.int_)
 
-        for i in range(len(self.dataA)):
-            X = np.int_(self.dataA[i])
-            Y = np.int_(self.dataB[i])
+        tetha = np.degrees(np.arctan2(Y, X)) + 360 * (Y < 0)
+        magnitude = np.sqrt(np.power(X, 2) + np.power(Y, 2))
 
-            # # Cek apakah nilai X berada di dalam rentang yang diinginkan
-            # if X < minimum_value or X > maximum_value:
-            #     X = np.clip(self.dataA[i], minimum_value, maximum_value).astype(int)
+        # Quadran ditentukan dari tetha sebelum dibulatkan (tiap kuadran 90 derajat)
+        quadran = np.floor_divide(tetha, 90).astype(np.int8) + 1
+        quadran[(X == 0) & (Y == 0)] = QUADRAN_NONE
+
+        quadranData = np.empty(len(X), dtype=QUADRAN_DTYPE)
+        quadranData['index'] = np.arange(len(X))
+        quadranData['X'] = X
+        quadranData['Y'] = Y
+        quadranData['tetha'] = np.round(tetha, 3)
+        quadranData['magnitude'] = np.round(magnitude, 3)
+        quadranData['quadran'] = quadran
+        return quadranData
 
-            # # Cek apakah nilai Y berada di dalam rentang yang diinginkan
-            # if Y < minimum_value or Y > maximum_value:
-            #     Y = np.clip(self.dataB[i], minimum_value, maximum_value).astype(int)
+    def getQuadranSummary(self, quadranData=None):
+        # Jumlah sumX, sumY, Tetha, Magnitude dan JumlahQuadran per quadran (Q1..Q4),
+        # urutan baris sama dengan FRAMES_DATA_QUADRAN_COMPONENTS -> array (5, 4)
+        if quadranData is None:
+            quadranData = self.getQuadranColumns()
 
-            # print('Data getQuadran ' , i, ' : ', self.dataA[i])
-            # print('Data x ' , i, ' : ', X, ' Tipe', type(X))
-            # # Y = np.int_(self.dataB[i])
-            # print('Data getQuadran ' , i, ' : ', self.dataB[i])
-            # print('Data y ' , i, ' : ', Y, ' Tipe', type(Y))
+        quadran = quadranData['quadran']
+        jumlahQuadran = len(QUADRAN_LABELS) + 1
 
-            tetha = np.degrees(np.arctan2(Y, X)) + 360 * (Y < 0)
-            magnitude = np.sqrt(np.power(X, 2) + np.power(Y, 2))
-            quadranLabel = ""
+        summary = np.empty((5, len(QUADRAN_LABELS)))
+        for row, column in enumerate(('X', 'Y', 'tetha', 'magnitude')):
+            summary[row] = np.bincount(quadran, weights=quadranData[column], minlength=jumlahQuadran)[1:]
+        summary[4] = np.bincount(quadran, minlength=jumlahQuadran)[1:]
+        return summary
 
-            if (X == 0) and (Y == 0):
+    def getQuadran(self):
+        # Format lama (array object berisi string) tetap tersedia untuk kompatibilitas
+        quadranData = self.getQuadranColumns()
+        output = np.empty((len(quadranData), 6), dtype=object)
+
+        for i, row in enumerate(quadranData):
+            if row['quadran'] == QUADRAN_NONE:
                 quadranLabel = "No Quadran X Y = 0"
             else:
-                if tetha >= 0 and tetha < 90:
-                    quadranLabel = "Q1"
-                elif tetha >= 90 and tetha < 180:
-                    quadranLabel = "Q2"
-                elif tetha >= 180 and tetha < 270:
-                    quadranLabel = "Q3"
-                elif tetha >= 270 and tetha < 360:
-                    quadranLabel = "Q4"
-                else:
-                    quadranLabel = "No Quadran"
-            quadranData[i, :] = [
+                quadranLabel = QUADRAN_LABELS[int(row['quadran'])]
+
+            output[i, :] = [
                 np.str_(i),
-                X, 
-                Y, 
-                format_number_and_round_numpy(tetha), 
-                format_number_and_round_numpy(magnitude), 
+                np.int_(row['X']),
+                np.int_(row['Y']),
+                format_number_and_round_numpy(row['tetha'].item()),
+                format_number_and_round_numpy(row['magnitude'].item()),
                 quadranLabel
             ]
-        return quadranData
+        return output
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from app.helper.constant import COMPONENTS_SETUP, BLOCKSIZE, QUADRAN_DIMENSIONS, FRAMES_DATA_QUADRAN_COMPONENTS
+
+# Fitur per blok hasil Quadran, urutan kolom sama dengan file training
+VEKTOR_FEATURES = ['X', 'Y', 'Tetha', 'Magnitude']
+
+class FeatureSchema:
+    """
+    Susunan kolom fitur yang tetap untuk setiap request (ditentukan oleh
+    COMPONENTS_SETUP, BLOCKSIZE, QUADRAN_DIMENSIONS dan FRAMES_DATA_QUADRAN_COMPONENTS).
+    Nama kolom dan posisi slice tiap komponen dihitung sekali saja.
+    """
+    def __init__(self, blockCounts):
+        self.blockCounts = dict(blockCounts)
+
+        self.allFeatureColumns = []
+        self.allFeatureSlices = {}
+        self.quadranColumns = []
+        self.quadranSlices = {}
+
+        for componentName, blockCount in self.blockCounts.items():
+            start = len(self.allFeatureColumns)
+            for i in range(blockCount):
+                for feature in VEKTOR_FEATURES:
+                    self.allFeatureColumns.append(f'{componentName}-{feature}{i+1}')
+            self.allFeatureSlices[componentName] = slice(start, len(self.allFeatureColumns))
+
+            start = len(self.quadranColumns)
+            for quadranDim in QUADRAN_DIMENSIONS:
+                for feature in FRAMES_DATA_QUADRAN_COMPONENTS:
+                    self.quadranColumns.append(f"{componentName}_{feature}_{quadranDim}")
+            self.quadranSlices[componentName] = slice(start, len(self.quadranColumns))
+
+    def createMatrices(self, capacity):
+        # Frame tanpa wajah tetap NaN, sama seperti kolom kosong pada DataFrame lama
+        allFeatures = np.full((capacity, len(self.allFeatureColumns)), np.nan)
+        quadran = np.full((capacity, len(self.quadranColumns)), np.nan)
+        return allFeatures, quadran
+
+@lru_cache(maxsize=None)
+def _get_feature_schema(blockCounts):
+    return FeatureSchema(blockCounts)
+
+def get_block_count(height, width, blockSize=BLOCKSIZE):
+    return (height // blockSize) * (width // blockSize)
+
+def get_feature_schema(componentsSetup=COMPONENTS_SETUP, blockSize=BLOCKSIZE):
+    # Ukuran ROI = objectDimension + 1 pixel (lihat extract_component_by_images)
+    blockCounts = tuple(
+        (componentName, get_block_count(info['object_dimension']['height'] + 1, info['object_dimension']['width'] + 1, blockSize))
+        for componentName, info in componentsSetup.items()
+    )
+    return _get_feature_schema(blockCounts)
+
+class FeatureMatrices:
+    """
+    Matriks float yang dialokasikan di awal untuk fitur semua frame.
+    Tahap POC/Vektor/Quadran menulis langsung ke slice baris dan komponennya.
+    """
+    def __init__(self, schema: FeatureSchema, capacity=200):
+        self.schema = schema
+        self.frames = []
+        self.allFeatures, self.quadran = schema.createMatrices(max(1, capacity))
+
+    def __len__(self):
+        return len(self.frames)
+
+    def addFrame(self, frameLabel):
+        # Tambah baris baru, kapasitas digandakan jika penuh
+        if len(self.frames) == len(self.allFeatures):
+            allFeatures, quadran = self.schema.createMatrices(len(self.allFeatures) * 2)
+            allFeatures[:len(self.frames)] = self.allFeatures
+            quadran[:len(self.frames)] = self.quadran
+            self.allFeatures, self.quadran = allFeatures, quadran
+
+        self.frames.append(frameLabel)
+        return len(self.frames) - 1
+
+    def isEmpty(self):
+        # Kosong jika tidak ada frame, atau tidak ada satu pun fitur yang terisi
+        rows = len(self.frames)
+        return rows == 0 or np.isnan(self.allFeatures[:rows]).all()
+
+    def getVektorRow(self, row, componentName):
+        # View (jumlah blok, 4) dengan kolom X, Y, Tetha, Magnitude
+        return self.allFeatures[row, self.schema.allFeatureSlices[componentName]].reshape(-1, len(VEKTOR_FEATURES))
+
+    def getQuadranRow(self, row, componentName):
+        # View (jumlah quadran, jumlah fitur quadran)
+        return self.quadran[row, self.schema.quadranSlices[componentName]].reshape(len(QUADRAN_DIMENSIONS), len(FRAMES_DATA_QUADRAN_COMPONENTS))
+
+    def getFeatureDataFrames(self):
+        # DataFrame fitur saja (tanpa kolom Frame/Folder Path/Label) untuk prediksi, tanpa copy
+        rows = len(self.frames)
+        df_fitur_all = pd.DataFrame(self.allFeatures[:rows], columns=self.schema.allFeatureColumns, copy=False)
+        df_quadran = pd.DataFrame(self.quadran[:rows], columns=self.schema.quadranColumns, copy=False)
+        return df_fitur_all, df_quadran
+
+    def getExportDataFrames(self):
+        # DataFrame lengkap dengan kolom Frame, Folder Path dan Label untuk ekspor CSV/XLSX
+        dataframes = []
+        for df in self.getFeatureDataFrames():
+            df.insert(0, 'Frame', self.frames)
+            df['Folder Path'] = "data_test"
+            df['Label'] = "data_test"
+            dataframes.append(df)
+        return tuple(dataframes)
+
+    def save(self, filepath):
+        # Simpan matriks fitur (hanya baris terisi) beserta susunan komponennya dalam NPZ terkompresi
+        rows = len(self.frames)
+        np.savez_compressed(
+            filepath,
+            frames=np.array(self.frames, dtype=str),
+            components=np.array(list(self.schema.blockCounts), dtype=str),
+            blockCounts=np.array(list(self.schema.blockCounts.values()), dtype=np.int64),
+            allFeatures=self.allFeatures[:rows],
+            quadran=self.quadran[:rows]
+        )
+
+    @classmethod
+    def load(cls, filepath):
+        # Kebalikan dari save(): schema dibangun ulang dari susunan komponen yang tersimpan
+        with np.load(filepath, allow_pickle=False) as data:
+            schema = _get_feature_schema(tuple(zip(data['components'].tolist(), data['blockCounts'].tolist())))
+            features = cls(schema, capacity=len(data['frames']))
+            features.frames = data['frames'].tolist()
+            features.allFeatures[:len(features.frames)] = data['allFeatures']
+            features.quadran[:len(features.frames)] = data['quadran']
+        return features
@@ -0,0 +1,86 @@
+import os
+
+# Variabel environment thread pool native (OpenMP/BLAS) yang dipakai NumPy/SciPy, diset di gunicorn.conf.py
+NATIVE_THREAD_ENV_VARS = [
+    'OMP_NUM_THREADS',
+    'OPENBLAS_NUM_THREADS',
+    'MKL_NUM_THREADS',
+    'BLIS_NUM_THREADS',
+    'VECLIB_MAXIMUM_THREADS',
+    'NUMEXPR_NUM_THREADS',
+]
+
+def limit_native_threads(threads):
+    """
+    Membatasi thread pool native yang sudah terlanjur dibuat di proses ini
+    (threadpoolctl jika ada) dan thread OpenCV. Mengembalikan objek limiter
+    threadpoolctl, atau None jika threadpoolctl tidak terpasang.
+    """
+    import cv2
+    cv2.setNumThreads(threads)
+
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return None
+    return threadpool_limits(limits=threads)
+
+def get_process_memory(pid='self'):
+    """
+    Memori satu proses dalam byte dari /proc/<pid>/smaps_rollup: rss, pss
+    (RSS dibagi rata dengan proses lain yang berbagi page), shared dan private.
+    None jika tidak tersedia (bukan Linux atau proses sudah berhenti).
+    """
+    fields = {'Rss': 'rss', 'Pss': 'pss', 'Shared_Clean': 'shared', 'Shared_Dirty': 'shared', 'Private_Clean': 'private', 'Private_Dirty': 'private'}
+    memory = {'rss': 0, 'pss': 0, 'shared': 0, 'private': 0}
+
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as file:
+            for line in file:
+                name, _, value = line.partition(':')
+                if name in fields:
+                    memory[fields[name]] += int(value.split()[0]) * 1024
+    except (OSError, ValueError):
+        return None
+    return memory
+
+def get_child_pids(parentPid):
+    # PID proses anak langsung dari parentPid (dibaca dari /proc/<pid>/stat)
+    children = []
+    for entry in os.listdir('/proc') if os.path.isdir('/proc') else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as file:
+                # Field ke-4 (ppid) berada setelah nama proses dalam kurung
+                ppid = int(file.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        if ppid == parentPid:
+            children.append(int(entry))
+    return sorted(children)
+
+def get_worker_memory_report():
+    """
+    Memori proses ini dan, jika berjalan di bawah server prefork (PREFORK_SERVER
+    diset oleh gunicorn.conf.py), master beserta semua worker saudaranya.
+    PSS menunjukkan seberapa banyak page model yang benar-benar dibagi.
+    """
+    pid = os.getpid()
+    prefork = bool(os.environ.get('PREFORK_SERVER'))
+    masterPid = os.getppid() if prefork else None
+
+    workers = []
+    for workerPid in get_child_pids(masterPid) if prefork else [pid]:
+        memory = get_process_memory(workerPid)
+        if memory is not None:
+            workers.append({"pid": workerPid, "current": workerPid == pid, **memory})
+
+    return {
+        "server": os.environ.get('PREFORK_SERVER') or 'development',
+        "master": {"pid": masterPid, **(get_process_memory(masterPid) or {})} if prefork else None,
+        "workers": workers,
+        "total_rss": sum(worker['rss'] for worker in workers),
+        "total_pss": sum(worker['pss'] for worker in workers),
+        "native_threads": {name: os.environ.get(name) for name in NATIVE_THREAD_ENV_VARS},
+    }
@@ -0,0 +1,127 @@
+import cv2
+import threading
+import time
+from collections import deque
+from app.helper.face import FaceTracker
+from app.helper.schema import FeatureMatrices, get_feature_schema
+from app.helper.helper import get_calculate_from_predict
+from app.helper.extraction import create_component_references, extract_frame_features
+
+# Status per frame pada sesi streaming
+STREAM_FRAME_NO_FACE = 'no_face'
+STREAM_FRAME_REFERENCE = 'reference'
+STREAM_FRAME_EXTRACTED = 'extracted'
+
+class StreamSession:
+    """
+    Satu sesi streaming webcam. Frame diproses satu per satu terhadap ROI acuan
+    yang diambil dari frame pertama yang berisi wajah, seperti pipeline video.
+
+    Memori tetap konstan berapa pun lamanya sesi: yang disimpan hanya tracker,
+    ROI acuan, penghitung frame dan windowSize label prediksi terakhir per model.
+    """
+    def __init__(self, sessionId, detector, predictor, trackerOptions, windowSize=30):
+        self.id = sessionId
+        self.tracker = FaceTracker(detector, predictor, **trackerOptions)
+        self.windowSize = windowSize
+        self.references = None
+        self.predictions = {}
+
+        self.framesReceived = 0
+        self.framesDropped = 0
+        self.framesExtracted = 0
+        self.createdAt = time.time()
+        self.lastActivity = self.createdAt
+
+        # Satu batch frame diproses dalam satu waktu agar urutan frame tetap terjaga
+        self.lock = threading.Lock()
+
+    def touch(self):
+        self.lastActivity = time.time()
+
+    def extractFeatures(self, frames):
+        """
+        frames: list of (frameIndex, image BGR). Mengembalikan FeatureMatrices
+        untuk frame yang berhasil diekstraksi dan status semua frame (urutan sama).
+        """
+        features = FeatureMatrices(get_feature_schema(), capacity=len(frames))
+        frameResults = []
+
+        for frameIndex, image in frames:
+            gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            shapes = self.tracker.getShapes(gray)
+
+            if not shapes:
+                frameResults.append({"frame": frameIndex, "status": STREAM_FRAME_NO_FACE})
+                continue
+
+            if self.references is None:
+                self.references = create_component_references(gray, shapes[0])
+                frameResults.append({"frame": frameIndex, "status": STREAM_FRAME_REFERENCE})
+                continue
+
+            featureRow = features.addFrame(frameIndex)
+            extract_frame_features(features, featureRow, gray, shapes, self.references)
+            frameResults.append({"frame": frameIndex, "status": STREAM_FRAME_EXTRACTED})
+
+        self.framesExtracted += len(features)
+        return features, frameResults
+
+    def addPredictions(self, keyName, labels):
+        # Label terbaru masuk ke window bergulir, label yang lebih lama dibuang
+        self.predictions.setdefault(keyName, deque(maxlen=self.windowSize)).extend(labels)
+
+    def getRollingPredictions(self):
+        # Hasil prediksi dihitung ulang hanya dari window terakhir
+        rolling = {}
+        for keyName, window in self.predictions.items():
+            if window:
+                result, listPredictions = get_calculate_from_predict(list(window))
+                rolling[keyName] = {"result": result, "list_predictions": listPredictions}
+        return rolling
+
+    def toDict(self):
+        return {
+            "session_id": self.id,
+            "has_reference": self.references is not None,
+            "frames_received": self.framesReceived,
+            "frames_dropped": self.framesDropped,
+            "frames_extracted": self.framesExtracted,
+            "window_size": self.windowSize,
+            "created_at": self.createdAt,
+            "last_activity": self.lastActivity,
+        }
+
+class StreamSessionStore:
+    """
+    Sesi streaming aktif di memori. Jumlah sesi dibatasi maxSessions dan sesi
+    yang tidak menerima frame selama idleTimeout detik dihapus otomatis.
+    """
+    def __init__(self, maxSessions=8, idleTimeout=60):
+        self.maxSessions = maxSessions
+        self.idleTimeout = idleTimeout
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def evictIdle(self):
+        deadline = time.time() - self.idleTimeout
+        with self.lock:
+            for sessionId in [key for key, session in self.sessions.items() if session.lastActivity < deadline]:
+                del self.sessions[sessionId]
+
+    def add(self, session):
+        self.evictIdle()
+        with self.lock:
+            if len(self.sessions) >= self.maxSessions:
+                return False
+            self.sessions[session.id] = session
+            return True
+
+    def get(self, sessionId):
+        self.evictIdle()
+        with self.lock:
+            return self.sessions.get(sessionId)
+
+    def remove(self, sessionId):
+        with self.lock:
+            return self.sessions.pop(sessionId, None)
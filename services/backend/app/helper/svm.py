@@ -0,0 +1,186 @@
+import warnings
+import numpy as np
+
+# Jumlah baris (frame) per blok saat menghitung kernel, membatasi ukuran matriks sementara
+SVM_SCORING_BLOCK_SIZE = 256
+# Jumlah sampel sintetis untuk pengecekan hasil terhadap model.predict
+SVM_PARITY_SAMPLES = 512
+
+class RbfSvmScorer:
+    """
+    Prediksi SVC (kernel RBF, one-vs-one) untuk satu batch frame sekaligus dengan
+    operasi matriks NumPy, memakai support vector, dual coefficient, intercept dan
+    gamma dari model sklearn yang sudah di-fit.
+
+    Decision value semua pasangan kelas dihitung dengan satu perkalian matriks
+    K @ C, dengan K kernel RBF (frame x support vector) dan C koefisien per pasangan
+    kelas. Voting one-vs-one mengikuti libsvm: dec > 0 untuk kelas pertama pasangan,
+    selain itu kelas kedua, seri dimenangkan indeks kelas terkecil.
+
+    Input dicek seperti check_array sklearn (2 dimensi, jumlah fitur sama dengan
+    n_features_in_, tanpa NaN/inf); input yang tidak valid ditolak dengan ValueError.
+    """
+    def __init__(self, model, dtype=np.float64, blockSize=SVM_SCORING_BLOCK_SIZE):
+        self.dtype = np.dtype(dtype)
+        self.blockSize = blockSize
+        self.classes = model.classes_
+        self.gamma = self.dtype.type(model._gamma)
+
+        # Support vector float64 dari file memory-mapped dipakai langsung (tanpa salinan)
+        supportVectors = model.support_vectors_
+        self.supportVectors = supportVectors if supportVectors.dtype == self.dtype else supportVectors.astype(self.dtype)
+        self.supportNorms = np.einsum('ij,ij->i', self.supportVectors, self.supportVectors)
+        self.nFeatures = getattr(model, 'n_features_in_', supportVectors.shape[1])
+
+        nSupport = getattr(model, '_n_support', None)
+        if nSupport is None:
+            nSupport = model.n_support_
+        nClasses = len(self.classes)
+        starts = np.concatenate([[0], np.cumsum(nSupport)])
+
+        # C[sv, p] untuk pasangan p = (i, j), i < j, urutan sama dengan intercept libsvm
+        dualCoef = np.asarray(model._dual_coef_)
+        pairs = [(i, j) for i in range(nClasses) for j in range(i + 1, nClasses)]
+        self.coefficients = np.zeros((len(supportVectors), len(pairs)), dtype=self.dtype)
+        self.positiveVotes = np.zeros((len(pairs), nClasses), dtype=np.int32)
+        self.negativeVotes = np.zeros((len(pairs), nClasses), dtype=np.int32)
+        for p, (i, j) in enumerate(pairs):
+            self.coefficients[starts[i]:starts[i + 1], p] = dualCoef[j - 1, starts[i]:starts[i + 1]]
+            self.coefficients[starts[j]:starts[j + 1], p] = dualCoef[i, starts[j]:starts[j + 1]]
+            self.positiveVotes[p, i] = 1
+            self.negativeVotes[p, j] = 1
+        self.intercept = np.asarray(model._intercept_, dtype=self.dtype)
+
+    @staticmethod
+    def supports(model):
+        return (
+            getattr(model, 'kernel', None) == 'rbf'
+            and hasattr(model, '_dual_coef_')
+            and isinstance(getattr(model, 'support_vectors_', None), np.ndarray)
+            and len(model.classes_) >= 2
+        )
+
+    def checkFeatures(self, features):
+        features = np.asarray(features, dtype=self.dtype)
+        if features.ndim != 2:
+            raise ValueError(f"Expected 2D array, got {features.ndim}D array instead.")
+        if features.shape[1] != self.nFeatures:
+            raise ValueError(f"X has {features.shape[1]} features, but the model is expecting {self.nFeatures} features as input.")
+        if not np.isfinite(features).all():
+            raise ValueError("Input X contains NaN or infinity.")
+        return features
+
+    def decisionValues(self, features):
+        # Decision value one-vs-one (frame x pasangan kelas), dihitung per blok frame
+        features = self.checkFeatures(features)
+        values = np.empty((len(features), self.coefficients.shape[1]), dtype=self.dtype)
+
+        for start in range(0, len(features), self.blockSize):
+            block = features[start:start + self.blockSize]
+            # ||x - sv||^2 = ||x||^2 + ||sv||^2 - 2 x.sv
+            distances = block @ self.supportVectors.T
+            distances *= -2
+            distances += np.einsum('ij,ij->i', block, block)[:, None]
+            distances += self.supportNorms[None, :]
+            np.maximum(distances, 0, out=distances)
+            distances *= -self.gamma
+            kernel = np.exp(distances, out=distances)
+
+            values[start:start + len(block)] = kernel @ self.coefficients
+        values += self.intercept
+        return values
+
+    def predict(self, features):
+        positive = self.decisionValues(features) > 0
+        votes = positive @ self.positiveVotes + (~positive) @ self.negativeVotes
+        return self.classes[np.argmax(votes, axis=1)]
+
+def get_parity_samples(model, count=SVM_PARITY_SAMPLES, seed=0):
+    """
+    Sampel deterministik untuk membandingkan hasil dengan model.predict: titik
+    di antara dua support vector acak (sering dekat batas keputusan, sehingga
+    perbedaan presisi cepat terlihat) ditambah sebagian support vector itu sendiri.
+    """
+    rng = np.random.default_rng(seed)
+    supportVectors = np.asarray(model.support_vectors_, dtype=np.float64)
+    first = rng.integers(0, len(supportVectors), count)
+    second = rng.integers(0, len(supportVectors), count)
+    weights = rng.random((count, 1))
+    samples = weights * supportVectors[first] + (1 - weights) * supportVectors[second]
+    return np.vstack([samples, supportVectors[:count]])
+
+def get_invalid_samples(samples):
+    # Batch yang harus ditolak seperti oleh sklearn: baris NaN, baris inf, jumlah fitur salah
+    withNan = samples[:8].copy()
+    withNan[3, 0] = np.nan
+    withInf = samples[:8].copy()
+    withInf[5, -1] = np.inf
+    return [withNan, withInf, samples[:8, :-1]]
+
+def raises_value_error(predict, features):
+    try:
+        predict(features)
+    except ValueError:
+        return True
+    return False
+
+class FastRbfSvc:
+    """
+    Pembungkus model SVC yang memakai RbfSvmScorer untuk predict(). Batch yang
+    ditolak scorer diteruskan ke model.predict, sehingga error-nya sama dengan
+    sklearn. Atribut lain (classes_, support_vectors_, ...) diteruskan ke model aslinya.
+    """
+    def __init__(self, model, scorer):
+        self.model = model
+        self.scorer = scorer
+
+    def predict(self, features):
+        try:
+            return self.scorer.predict(features)
+        except ValueError:
+            return self.model.predict(features)
+
+    def __getattr__(self, name):
+        return getattr(self.__dict__['model'], name)
+
+    def __repr__(self):
+        return f"FastRbfSvc({self.model!r}, dtype={self.scorer.dtype.name})"
+
+def build_fast_svm(model, dtype='float64', name=None):
+    """
+    Mengembalikan FastRbfSvc jika model didukung, hasil prediksinya sama persis
+    dengan model.predict pada sampel pengecekan dan scorer menolak setiap batch
+    tidak valid (NaN, inf, jumlah fitur salah) yang ditolak model.predict; selain
+    itu model aslinya.
+    """
+    label = name or type(model).__name__
+    if not RbfSvmScorer.supports(model):
+        print(f"[INFO] Fast SVM scoring not supported for {label}, using model.predict.")
+        return model
+
+    try:
+        scorer = RbfSvmScorer(model, dtype=dtype)
+        samples = get_parity_samples(model)
+        with warnings.catch_warnings():
+            # Model yang di-fit dengan DataFrame memperingatkan input tanpa nama kolom
+            warnings.simplefilter('ignore', UserWarning)
+            expected = model.predict(samples)
+            mismatches = int(np.sum(scorer.predict(samples) != expected))
+            # Batch yang lolos di scorer tapi ditolak sklearn akan memberi label diam-diam
+            accepted = sum(
+                1 for invalid in get_invalid_samples(samples)
+                if raises_value_error(model.predict, invalid) and not raises_value_error(scorer.predict, invalid)
+            )
+    except Exception as e:
+        print(f"[WARN] Fast SVM scoring disabled for {label}: {e}")
+        return model
+
+    if mismatches:
+        print(f"[WARN] Fast SVM scoring disabled for {label}: {mismatches}/{len(samples)} predictions differ from model.predict.")
+        return model
+    if accepted:
+        print(f"[WARN] Fast SVM scoring disabled for {label}: {accepted} invalid batch(es) accepted that model.predict rejects.")
+        return model
+
+    print(f"[INFO] Fast SVM scoring enabled for {label} ({scorer.dtype.name}, {len(samples)} parity samples).")
+    return FastRbfSvc(model, scorer)
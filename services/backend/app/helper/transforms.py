@@ -0,0 +1,65 @@
+import threading
+import time
+
+class TransformGraph:
+    """
+    Definisi transformasi fitur sebagai graf node bernama (scaler, PCA, seleksi
+    fitur, ...). Node sumber diisi data mentah per request; node lain adalah
+    fungsi dari output node input-nya. Graf dibuat sekali saat import, hasilnya
+    dihitung per request lewat evaluate().
+    """
+    def __init__(self):
+        self.nodes = {}
+
+    def addSource(self, name):
+        self.nodes[name] = None
+
+    def add(self, name, inputs, transform):
+        for inputName in inputs:
+            if inputName not in self.nodes:
+                raise ValueError(f"Unknown input node '{inputName}' for transform '{name}'.")
+        self.nodes[name] = (tuple(inputs), transform)
+
+    def evaluate(self, sources):
+        missing = [name for name, node in self.nodes.items() if node is None and name not in sources]
+        if missing:
+            raise ValueError(f"Missing source data for: {', '.join(missing)}")
+        return TransformResults(self, sources)
+
+class TransformResults:
+    """
+    Hasil graf untuk satu request. Node dihitung saat pertama kali diminta lalu
+    disimpan, jadi intermediate yang dipakai beberapa model hanya dihitung sekali.
+    Error sebuah node juga disimpan dan dilempar lagi ke setiap pemakainya.
+    Aman dipanggil dari beberapa thread sekaligus.
+    """
+    def __init__(self, graph, sources):
+        self.graph = graph
+        self.values = dict(sources)
+        self.errors = {}
+        # Waktu tiap node tanpa waktu node input-nya (detik)
+        self.timings = {}
+        self.locks = {name: threading.Lock() for name, node in graph.nodes.items() if node is not None}
+
+    def get(self, name):
+        if name not in self.values and name not in self.errors:
+            with self.locks[name]:
+                if name not in self.values and name not in self.errors:
+                    self.compute(name)
+
+        if name in self.errors:
+            raise self.errors[name]
+        return self.values[name]
+
+    def compute(self, name):
+        inputs, transform = self.graph.nodes[name]
+        try:
+            arguments = [self.get(inputName) for inputName in inputs]
+            startTime = time.perf_counter()
+            self.values[name] = transform(*arguments)
+            self.timings[name] = time.perf_counter() - startTime
+        except Exception as e:
+            self.errors[name] = e
+
+    def getTimings(self):
+        return {name: round(seconds, 4) for name, seconds in self.timings.items()}
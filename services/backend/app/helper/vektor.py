@@ -23,56 +23,40 @@ class Vektor:
         rep_x = np.arange(-(nilTeng), medX)   
         rep_y = np.arange(nilTeng, -(medX), -1) 
 
-        # output = np.empty((len(self.coorAwal), 6))
-        output = np.zeros((len(self.coorAwal), 6))
-        
-        # print('len(self.coorAwal) : ', len(self.coorAwal))
-        # print('Data Output Pertama (0) : ', output[0])
-
         valPOC = self.poc
+        jumlahBlok = valPOC.shape[2]
+        output = np.zeros((len(self.coorAwal), 6))
 
-        for i in range(valPOC.shape[2]):
-            r = valPOC[:, :, i]
-            
-            val_max = np.max(np.max(r))
-            temp_y, temp_x = np.where(r == np.max(r))
-            
-            if (len(temp_y) > 1 or len(temp_y) > 1) :
-                temp_x = nilTeng
-                temp_y = nilTeng
-            else :
-                temp_x = temp_x[0]
-                temp_y = temp_y[0]
-                
-                if temp_x != nilTeng or temp_y !=nilTeng: 
-                    corX = self.coorAwal[i][0]  # koordinat X mulai
-                    corY = self.coorAwal[i][1]  # koordinat Y mulai
-                
-                    tX = corX-medX
-                    tY = corY-medY
-
-                    oX = rep_x[cur_x[temp_x]]
-                    oY = rep_y[cur_y[temp_y]]
-
-                    mX = (corX - (mb_x - temp_x))
-                    mY = (corY - (mb_y - temp_y))
-                    
-                    p1 = [tX, tY]
-                    p2 = [mX, mY]
-                    V = np.array(p2) - np.array(p1)
-
-                    # # Cek apakah nilai X berada di dalam rentang yang diinginkan
-                    # if oX < minimum_value or oX > maximum_value:
-                    #     oX = np.clip(oX, minimum_value, maximum_value).astype(int)
-                    
-                    # # Cek apakah nilai Y berada di dalam rentang yang diinginkan
-                    # if oY < minimum_value or oY > maximum_value:
-                    #     oY = np.clip(oY, minimum_value, maximum_value).astype(int)
-                    
-                    output[i, 0] = p1[0]
-                    output[i, 1] = p1[1]
-                    output[i, 2] = V[0]
-                    output[i, 3] = V[1]
-                    output[i, 4] = oX
-                    output[i, 5] = oY
+        # Ratakan setiap blok menjadi satu kolom (urutan baris per baris, sama seperti np.where)
+        flatPOC = valPOC.reshape(mb_y * mb_x, jumlahBlok)
+        val_max = flatPOC.max(axis=0)
+
+        # Blok dengan lebih dari satu puncak dianggap tidak bergerak
+        jumlahPuncak = np.count_nonzero(flatPOC == val_max, axis=0)
+        idxPuncak = flatPOC.argmax(axis=0)
+        temp_y = idxPuncak // mb_x
+        temp_x = idxPuncak % mb_x
+
+        # Hanya blok dengan puncak tunggal di luar titik tengah yang punya vektor
+        bergerak = (jumlahPuncak == 1) & ((temp_x != nilTeng) | (temp_y != nilTeng))
+        temp_x = temp_x[bergerak]
+        temp_y = temp_y[bergerak]
+
+        corX = self.coorAwal[:jumlahBlok, 0][bergerak]  # koordinat X mulai
+        corY = self.coorAwal[:jumlahBlok, 1][bergerak]  # koordinat Y mulai
+
+        tX = corX - medX
+        tY = corY - medY
+
+        mX = (corX - (mb_x - temp_x))
+        mY = (corY - (mb_y - temp_y))
+
+        output[:jumlahBlok][bergerak] = np.column_stack((
+            tX,
+            tY,
+            mX - tX,
+            mY - tY,
+            rep_x[cur_x[temp_x]],
+            rep_y[cur_y[temp_y]],
+        ))
         return output
@@ -1,5 +1,5 @@
 from app import app, response
-from app.controller import DataModelController
+from app.controller import DataModelController, JobController, StreamController, ServerController
 from flask import request
 import os
 
@@ -14,3 +14,55 @@ def upload():
         return DataModelController.store()
     else:
         return response.error(405, "Method Not Allowed")
+
+@app.route('/data-model/videos/<string:video_name>.webm', endpoint='playable_video', methods=['GET'])
+def playable_video(video_name):
+    return DataModelController.show_playable_video(video_name)
+
+@app.route('/data-model/models', methods=['GET'])
+def show_models():
+    return DataModelController.show_models()
+
+@app.route('/server/workers', methods=['GET'])
+def show_server_workers():
+    return ServerController.show_workers()
+
+@app.route('/data-model/features/<string:video_name>/<string:filename>', endpoint='feature_export', methods=['GET'])
+def show_feature_export(video_name, filename):
+    return DataModelController.show_feature_export(video_name, filename)
+
+@app.route('/data-model/previews/<string:video_name>/<path:filename>', endpoint='preview_image', methods=['GET'])
+def show_preview_image(video_name, filename):
+    return DataModelController.show_preview_image(video_name, filename)
+
+@app.route('/data-model/jobs', methods=['POST'])
+def store_job():
+    return JobController.store()
+
+@app.route('/data-model/jobs/<string:job_id>', endpoint='job_status', methods=['GET'])
+def show_job(job_id):
+    return JobController.show(job_id)
+
+@app.route('/data-model/jobs/<string:job_id>/result', endpoint='job_result', methods=['GET'])
+def show_job_result(job_id):
+    return JobController.show_result(job_id)
+
+@app.route('/data-model/jobs/<string:job_id>/events', endpoint='job_events', methods=['GET'])
+def show_job_events(job_id):
+    return JobController.show_events(job_id)
+
+@app.route('/data-model/streams', methods=['POST'])
+def store_stream():
+    return StreamController.store()
+
+@app.route('/data-model/streams/<string:session_id>', endpoint='stream_session', methods=['GET'])
+def show_stream(session_id):
+    return StreamController.show(session_id)
+
+@app.route('/data-model/streams/<string:session_id>', methods=['DELETE'])
+def destroy_stream(session_id):
+    return StreamController.destroy(session_id)
+
+@app.route('/data-model/streams/<string:session_id>/frames', endpoint='stream_frames', methods=['POST'])
+def store_stream_frames(session_id):
+    return StreamController.store_frames(session_id)
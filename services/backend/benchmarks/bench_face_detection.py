@@ -0,0 +1,109 @@
+"""
+Benchmark deteksi wajah pada beberapa skala (FACE_DETECTION_SCALE).
+
+Untuk setiap skala dihitung waktu rata-rata detector per frame, speed-up terhadap
+skala 1.0, dan pergeseran (drift) 68 landmark dibanding landmark dari deteksi
+resolusi penuh.
+
+Contoh (dijalankan dari services/backend):
+    python -m benchmarks.bench_face_detection assets/videos/contoh.mp4 --scales 1.0 0.75 0.5 0.35
+"""
+import argparse
+import json
+import os
+import time
+import cv2
+import dlib
+import numpy as np
+from app.helper.face import FaceTracker
+from app.helper.constant import MODEL_PREDICTOR
+
+def read_gray_frames(pathInputVideo, maxFrames):
+    frames = []
+    vidcap = cv2.VideoCapture(pathInputVideo)
+    while len(frames) < maxFrames:
+        success, image = vidcap.read()
+        if not success:
+            break
+        frames.append(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+    vidcap.release()
+    return frames
+
+def shape_to_array(shape):
+    return np.array([[point.x, point.y] for point in shape.parts()], dtype=float)
+
+def run_scale(frames, detector, predictor, scale, upsample):
+    # Mode full agar detector benar-benar dijalankan di setiap frame
+    tracker = FaceTracker(detector, predictor, mode="full", detectionScale=scale, upsample=upsample)
+
+    landmarks = []
+    detect_seconds = 0.0
+    for gray in frames:
+        start_time = time.perf_counter()
+        rects = tracker.detectFull(gray)
+        detect_seconds += time.perf_counter() - start_time
+
+        if rects:
+            rect = max(rects, key=lambda rect: rect.area())
+            landmarks.append(shape_to_array(predictor(gray, rect)))
+        else:
+            landmarks.append(None)
+
+    return detect_seconds / max(1, len(frames)), landmarks
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('video')
+    parser.add_argument('--scales', type=float, nargs='+', default=[1.0, 0.75, 0.5, 0.35, 0.25])
+    parser.add_argument('--upsample', type=int, default=0)
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--predictor', default=os.path.join('assets', 'models', MODEL_PREDICTOR))
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON')
+    args = parser.parse_args()
+
+    frames = read_gray_frames(args.video, args.frames)
+    if not frames:
+        raise SystemExit(f"Failed to read frames from {args.video}")
+
+    detector = dlib.get_frontal_face_detector()
+    predictor = dlib.shape_predictor(args.predictor)
+
+    # Skala 1.0 selalu dihitung sebagai acuan
+    scales = [1.0] + [scale for scale in args.scales if scale != 1.0]
+    baseline_seconds, baseline_landmarks = run_scale(frames, detector, predictor, 1.0, args.upsample)
+
+    results = []
+    for scale in scales:
+        if scale == 1.0:
+            seconds, landmarks = baseline_seconds, baseline_landmarks
+        else:
+            seconds, landmarks = run_scale(frames, detector, predictor, scale, args.upsample)
+
+        drift = [
+            np.linalg.norm(current - baseline, axis=1)
+            for current, baseline in zip(landmarks, baseline_landmarks)
+            if current is not None and baseline is not None
+        ]
+        drift = np.concatenate(drift) if drift else np.array([np.nan])
+
+        results.append({
+            "scale": scale,
+            "upsample": args.upsample,
+            "detect_ms_per_frame": round(seconds * 1000, 3),
+            "speedup": round(baseline_seconds / seconds, 2) if seconds else None,
+            "faces_found": sum(landmark is not None for landmark in landmarks),
+            "landmark_drift_mean_px": round(float(np.mean(drift)), 3),
+            "landmark_drift_max_px": round(float(np.max(drift)), 3),
+        })
+
+    print(f"{len(frames)} frames, {frames[0].shape[1]}x{frames[0].shape[0]}")
+    print(f"{'scale':>6} {'ms/frame':>9} {'speedup':>8} {'faces':>6} {'drift mean':>11} {'drift max':>10}")
+    for result in results:
+        print(f"{result['scale']:>6} {result['detect_ms_per_frame']:>9} {result['speedup']:>8} {result['faces_found']:>6} {result['landmark_drift_mean_px']:>11} {result['landmark_drift_max_px']:>10}")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({"video": args.video, "frames": len(frames), "results": results}, file, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+"""
+Benchmark per tahap pipeline analisis pada video sintetis (lihat benchmarks/fixtures.py).
+
+Untuk setiap kombinasi panjang clip dan resolusi dibuat video deterministik, lalu
+setiap tahap diukur terpisah (median dari --repeat kali):
+
+    frame_decode        get_frames_stream_by_input_video
+    face_landmarks      FaceTracker.getShapes (detector + shape predictor)
+    component_crop      extract_component_by_images untuk semua komponen
+    poc / vektor        POC.getPOC / Vektor.getVektor
+    quadran             Quadran + penulisan baris FeatureMatrices
+    feature_extraction  _extract_features_from_frames (gabungan tahap di atas, sesuai konfigurasi)
+    feature_transforms  node FEATURE_GRAPH yang dipakai MODEL_GROUPS
+    prediction          _run_all_predictions
+    store               POST /data-model/data-test end to end (result cache dimatikan)
+
+Jika detector tidak menemukan pola wajah sintetis, landmark diambil dari shape
+predictor pada kotak wajah yang diketahui, sehingga tahap POC/Vektor/Quadran dan
+prediksi tetap terukur; faces_detected di hasil menunjukkan jumlah frame yang
+benar-benar terdeteksi.
+
+Contoh (dijalankan dari services/backend):
+    python -m benchmarks.bench_pipeline --lengths 30 90 --resolutions 320x240 640x480 --output before.json
+    python -m benchmarks.bench_pipeline --lengths 30 90 --resolutions 320x240 640x480 --compare before.json
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Upload yang sama diulang beberapa kali, cache hasil harus dimatikan sebelum app di-import
+os.environ['RESULT_CACHE_ENABLED'] = 'false'
+
+import cv2
+import dlib
+from app import app
+from app.controller import DataModelController
+from app.helper.cache import remove_path
+from app.helper.constant import COMPONENTS_SETUP, BLOCKSIZE
+from app.helper.extraction import create_component_references, write_component_features
+from app.helper.face import FaceTracker
+from app.helper.poc import POC
+from app.helper.preprocessing import get_frames_stream_by_input_video, extract_component_by_images
+from app.helper.quadran import Quadran
+from app.helper.schema import FeatureMatrices, get_feature_schema
+from app.helper.vektor import Vektor
+from benchmarks.fixtures import write_synthetic_clip
+
+STAGES = [
+    'frame_decode', 'face_landmarks', 'component_crop', 'poc', 'vektor', 'quadran',
+    'feature_extraction', 'feature_transforms', 'prediction', 'store',
+]
+
+def parse_resolution(value):
+    width, _, height = value.lower().partition('x')
+    return int(width), int(height)
+
+def open_frames(path):
+    frames, error = get_frames_stream_by_input_video(
+        path,
+        targetFps=app.config['FRAME_SAMPLING_TARGET_FPS'],
+        stride=app.config['FRAME_SAMPLING_STRIDE'],
+        maxFrames=app.config['FRAME_SAMPLING_MAX_FRAMES']
+    )
+    if error:
+        raise SystemExit(error)
+    return frames
+
+def run_stages(clip):
+    """
+    Satu putaran tahap-tahap terpisah. Mengembalikan (detik per tahap, FeatureMatrices,
+    jumlah frame, jumlah frame dengan wajah terdeteksi).
+    """
+    timings = {stage: 0.0 for stage in ['frame_decode', 'face_landmarks', 'component_crop', 'poc', 'vektor', 'quadran']}
+
+    startTime = time.perf_counter()
+    grays = [cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) for _, image in open_frames(clip['path'])]
+    timings['frame_decode'] = time.perf_counter() - startTime
+
+    detector, predictor = DataModelController.get_face_models()
+    tracker = FaceTracker(detector, predictor, **DataModelController._get_tracker_options())
+    fallbackRect = dlib.rectangle(*clip['face_rectangle'])
+
+    features = FeatureMatrices(get_feature_schema(), capacity=len(grays))
+    references = None
+    facesDetected = 0
+
+    for index, gray in enumerate(grays):
+        startTime = time.perf_counter()
+        shapes = tracker.getShapes(gray)
+        if shapes:
+            facesDetected += 1
+        else:
+            shapes = [predictor(gray, fallbackRect)]
+        timings['face_landmarks'] += time.perf_counter() - startTime
+
+        if references is None:
+            references = create_component_references(gray, shapes[0])
+            continue
+
+        featureRow = features.addFrame(f"{index + 1}(img{index + 1})")
+        for componentName, componentInfo in COMPONENTS_SETUP.items():
+            startTime = time.perf_counter()
+            currentImage = extract_component_by_images(
+                image=gray,
+                shape=shapes[0],
+                objectRectangle=componentInfo['object_rectangle'],
+                pixelShifting=componentInfo['pixel_shifting'],
+                objectDimension=componentInfo['object_dimension']
+            )
+            cropTime = time.perf_counter()
+
+            referenceImage, referenceSpectrum = references[componentName]
+            valPOC = POC(referenceImage, currentImage, BLOCKSIZE, spectrumCur=referenceSpectrum).getPOC()
+            pocTime = time.perf_counter()
+
+            quivData = Vektor(valPOC, BLOCKSIZE).getVektor()
+            vektorTime = time.perf_counter()
+
+            initQuadran = Quadran(quivData)
+            write_component_features(features, featureRow, componentName, initQuadran, initQuadran.getQuadranColumns())
+            quadranTime = time.perf_counter()
+
+            timings['component_crop'] += cropTime - startTime
+            timings['poc'] += pocTime - cropTime
+            timings['vektor'] += vektorTime - pocTime
+            timings['quadran'] += quadranTime - vektorTime
+
+    return timings, features, len(grays), facesDetected
+
+def run_feature_extraction(clip, framesDir):
+    startTime = time.perf_counter()
+    with app.test_request_context():
+        features, _ = DataModelController._extract_features_from_frames(open_frames(clip['path']), framesDir)
+    return time.perf_counter() - startTime, len(features)
+
+def run_predictions(features):
+    # Transform dihitung dulu, sehingga waktu prediksi hanya berisi model.predict
+    featureSets = DataModelController._prepare_feature_sets(*features.getFeatureDataFrames())
+    nodes = {config['features'] for group in DataModelController.MODEL_GROUPS.values() for config in group.values()}
+
+    startTime = time.perf_counter()
+    for node in nodes:
+        try:
+            featureSets.get(node)
+        except Exception:
+            pass
+    transformTime = time.perf_counter() - startTime
+
+    startTime = time.perf_counter()
+    results = DataModelController._run_all_predictions(featureSets)
+    predictionTime = time.perf_counter() - startTime
+
+    errors = {
+        f"{metodeKey}with{trainKey}": result['error']
+        for trainKey, methods in results.items()
+        for metodeKey, result in methods.items()
+        if 'error' in result
+    }
+    return transformTime, predictionTime, errors
+
+def run_store(client, clip, withPreview):
+    with open(clip['path'], 'rb') as file:
+        startTime = time.perf_counter()
+        result = client.post(
+            '/data-model/data-test',
+            data={'file': (file, os.path.basename(clip['path'])), 'with_preview': 'true' if withPreview else 'false'},
+            content_type='multipart/form-data'
+        )
+        seconds = time.perf_counter() - startTime
+
+    body = result.get_json() or {}
+    data = body.get('data')
+    if isinstance(data, dict) and data.get('video'):
+        remove_store_outputs(os.path.splitext(data['video']['name'])[0])
+    return seconds, result.status_code, body.get('message')
+
+def remove_store_outputs(filenameBase):
+    # Video, fitur dan folder preview hasil request benchmark dihapus lagi dari assets
+    for root, directories, filenames in os.walk(app.config['UPLOAD_FOLDER']):
+        for name in directories + filenames:
+            if name.startswith(filenameBase):
+                remove_path(os.path.join(root, name))
+
+def summarize(samples, frameCount):
+    median = statistics.median(samples)
+    return {
+        "median_seconds": round(median, 4),
+        "min_seconds": round(min(samples), 4),
+        "ms_per_frame": round(median * 1000 / frameCount, 3) if frameCount else None,
+    }
+
+def benchmark_clip(clip, repeat, withStore, withPreview, workDir):
+    samples = {stage: [] for stage in STAGES}
+    client = app.test_client()
+    result = {key: clip[key] for key in ['frames', 'width', 'height', 'fps', 'seed']}
+
+    for _ in range(repeat):
+        timings, features, frameCount, facesDetected = run_stages(clip)
+        for stage, seconds in timings.items():
+            samples[stage].append(seconds)
+
+        seconds, extractedFrames = run_feature_extraction(clip, os.path.join(workDir, 'frames'))
+        samples['feature_extraction'].append(seconds)
+
+        transformTime, predictionTime, errors = run_predictions(features)
+        samples['feature_transforms'].append(transformTime)
+        samples['prediction'].append(predictionTime)
+
+        if withStore:
+            seconds, statusCode, message = run_store(client, clip, withPreview)
+            samples['store'].append(seconds)
+            result['store_status'] = statusCode
+            result['store_message'] = message
+
+    result['sampled_frames'] = frameCount
+    result['faces_detected'] = facesDetected
+    result['extracted_frames'] = extractedFrames
+    result['prediction_errors'] = errors
+    result['stages'] = {stage: summarize(values, frameCount) for stage, values in samples.items() if values}
+    return result
+
+def get_clip_key(clip):
+    return f"{clip['frames']}f@{clip['width']}x{clip['height']}"
+
+def print_results(results, baseline=None):
+    baselineClips = {get_clip_key(clip): clip for clip in (baseline or {}).get('clips', [])}
+
+    for clip in results['clips']:
+        key = get_clip_key(clip)
+        print(f"\n{key}: {clip['sampled_frames']} sampled frames, {clip['faces_detected']} with a detected face")
+        if clip.get('store_status') not in (None, 200):
+            print(f"  store: {clip['store_status']} {clip['store_message']}")
+        if clip['prediction_errors']:
+            print(f"  prediction errors: {len(clip['prediction_errors'])} models ({next(iter(clip['prediction_errors'].values()))})")
+
+        print(f"  {'stage':<20} {'median s':>10} {'min s':>10} {'ms/frame':>10}" + (f" {'vs base':>8}" if baseline else ''))
+        for stage, timing in clip['stages'].items():
+            line = f"  {stage:<20} {timing['median_seconds']:>10} {timing['min_seconds']:>10} {timing['ms_per_frame']:>10}"
+            base = baselineClips.get(key, {}).get('stages', {}).get(stage)
+            if baseline:
+                ratio = base['median_seconds'] / timing['median_seconds'] if base and timing['median_seconds'] else None
+                line += f" {f'{ratio:.2f}x' if ratio else '-':>8}"
+            print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lengths', type=int, nargs='+', default=[30, 90], help='Jumlah frame tiap clip')
+    parser.add_argument('--resolutions', nargs='+', default=['320x240', '640x480'])
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--skip-store', action='store_true', help='Tanpa pengukuran store() end to end')
+    parser.add_argument('--with-preview', action='store_true', help='store() dengan with_preview=true')
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON')
+    parser.add_argument('--compare', help='JSON hasil run sebelumnya untuk dibandingkan (speed-up = lama / baru)')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+    # Model dimuat lebih dulu agar waktu muat tidak ikut terukur di tahap pertama
+    DataModelController.MODEL_REGISTRY.loadAll()
+
+    # Semua tahap setelah frame_decode butuh landmark dari shape predictor
+    if DataModelController.get_face_models()[1] is None:
+        sys.exit(f"[ERROR] Shape predictor not available ({DataModelController.DLIB_PREDICTOR_PATH}), "
+                 f"place {os.path.basename(DataModelController.DLIB_PREDICTOR_PATH)} in the models folder first.")
+
+    workDir = tempfile.mkdtemp(prefix='bench-pipeline-')
+    try:
+        clips = []
+        for resolution in args.resolutions:
+            width, height = parse_resolution(resolution)
+            for length in args.lengths:
+                path = os.path.join(workDir, f'clip-{length}-{width}x{height}.avi')
+                clip = write_synthetic_clip(path, length, width, height, fps=args.fps, seed=args.seed)
+                print(f"[INFO] Benchmarking {get_clip_key(clip)}...")
+                clips.append(benchmark_clip(clip, args.repeat, not args.skip_store, args.with_preview, workDir))
+    finally:
+        shutil.rmtree(workDir, ignore_errors=True)
+
+    results = {
+        "python": sys.version.split()[0],
+        "created_at": time.time(),
+        "repeat": args.repeat,
+        "config": {
+            name: app.config[name]
+            for name in [
+                'FRAME_SAMPLING_TARGET_FPS', 'FRAME_SAMPLING_STRIDE', 'FRAME_SAMPLING_MAX_FRAMES',
+                'FACE_DETECTION_MODE', 'FACE_DETECTION_SCALE', 'FEATURE_EXTRACTION_WORKERS',
+                'PREDICTION_WORKERS', 'SVM_SCORING_ENGINE', 'SVM_SCORING_DTYPE',
+            ]
+        },
+        "clips": clips,
+    }
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2, default=str)
+
+if __name__ == '__main__':
+    main()
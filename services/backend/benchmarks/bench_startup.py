@@ -0,0 +1,115 @@
+"""
+Benchmark waktu start aplikasi (cold start `from app import app`).
+
+Setiap run dijalankan di proses Python baru dengan `-X importtime`, sehingga
+yang diukur adalah import dingin seperti pada worker yang baru dinyalakan.
+Dilaporkan waktu import (median/min/max), modul dengan waktu import kumulatif
+terbesar, dan modul berat yang seharusnya tidak ikut ter-import saat start.
+
+Exit code 1 jika median melebihi --budget atau ada modul --forbid yang ter-import,
+jadi bisa dipakai sebagai pengecekan di CI.
+
+Contoh (dijalankan dari services/backend):
+    python -m benchmarks.bench_startup --runs 5 --budget 2.0
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+CHILD_CODE = """
+import json, sys, time
+start_time = time.perf_counter()
+from app import app
+elapsed = time.perf_counter() - start_time
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+def parse_importtime(stderr):
+    # Baris: "import time: self [us] | cumulative | nama" (indentasi nama = kedalaman import)
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, selfTime, cumulativeTime, name = [part for part in line.replace('import time:', '|', 1).split('|')]
+        modules.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": round(int(selfTime) / 1000, 2),
+            "cumulative_ms": round(int(cumulativeTime) / 1000, 2),
+        })
+    return modules
+
+def run_once():
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD_CODE],
+        capture_output=True, text=True, cwd=os.getcwd()
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Importing the app failed:\n{result.stderr[-2000:]}")
+
+    # Log aplikasi saat import juga ke stdout, hasil JSON selalu di baris terakhir
+    child = json.loads(result.stdout.strip().splitlines()[-1])
+    return child['seconds'], child['modules'], parse_importtime(result.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=2.0, help='Batas median waktu import (detik)')
+    parser.add_argument('--forbid', nargs='*', default=['moviepy', 'matplotlib'], help='Modul yang tidak boleh ter-import saat start')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON')
+    args = parser.parse_args()
+
+    timings = []
+    for _ in range(args.runs):
+        seconds, loadedModules, importtimes = run_once()
+        timings.append(seconds)
+
+    # Modul terberat dari run terakhir (hanya sampai dua tingkat import)
+    heaviest = sorted(
+        (module for module in importtimes if module['depth'] <= 2),
+        key=lambda module: module['cumulative_ms'],
+        reverse=True
+    )[:args.top]
+    forbiddenLoaded = sorted({
+        module.split('.')[0] for module in loadedModules
+        if module.split('.')[0] in args.forbid
+    })
+
+    median = statistics.median(timings)
+    result = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "median_seconds": round(median, 4),
+        "min_seconds": round(min(timings), 4),
+        "max_seconds": round(max(timings), 4),
+        "budget_seconds": args.budget,
+        "within_budget": median <= args.budget,
+        "forbidden_modules_loaded": forbiddenLoaded,
+        "heaviest_imports": heaviest,
+    }
+
+    print(f"from app import app: median {result['median_seconds']}s (min {result['min_seconds']}s, max {result['max_seconds']}s), budget {args.budget}s")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for module in heaviest:
+        print(f"{module['cumulative_ms']:>14} {module['self_ms']:>9}  {'  ' * module['depth']}{module['module']}")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(result, file, indent=2)
+
+    failed = False
+    if not result['within_budget']:
+        print(f"[FAIL] Startup import time {result['median_seconds']}s exceeds the {args.budget}s budget.")
+        failed = True
+    if forbiddenLoaded:
+        print(f"[FAIL] Modules that should be deferred were imported at startup: {', '.join(forbiddenLoaded)}")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
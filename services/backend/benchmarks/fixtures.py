@@ -0,0 +1,91 @@
+"""
+Video sintetis deterministik untuk benchmark.
+
+Setiap frame berisi pola mirip wajah (oval, alis, mata, hidung, mulut) di atas
+latar bertekstur. Kepala bergeser beberapa piksel, alis naik-turun dan sudut
+mulut melebar mengikuti gelombang sinus, sehingga POC/Vektor mendapat gerakan
+kecil yang terkontrol. Dengan seed yang sama, isi frame selalu sama.
+"""
+import math
+import cv2
+import numpy as np
+
+def get_face_rectangle(width, height):
+    # Kotak wajah (left, top, right, bottom) pada posisi diam, dipakai jika detector tidak menemukan wajah
+    faceHeight = int(height * 0.6)
+    faceWidth = int(faceHeight * 0.75)
+    left = width // 2 - faceWidth // 2
+    top = height // 2 - faceHeight // 2
+    return left, top, left + faceWidth, top + faceHeight
+
+def draw_face_frame(width, height, index, fps, texture):
+    t = index / fps
+    shiftX = int(round(2 * math.sin(2 * math.pi * 0.5 * t)))
+    shiftY = int(round(1 * math.sin(2 * math.pi * 0.3 * t)))
+    browRaise = 3 * math.sin(2 * math.pi * 1.0 * t)
+    smile = 0.5 + 0.5 * math.sin(2 * math.pi * 0.7 * t)
+
+    image = texture.copy()
+    left, top, right, bottom = get_face_rectangle(width, height)
+    faceWidth, faceHeight = right - left, bottom - top
+    centerX, centerY = (left + right) // 2 + shiftX, (top + bottom) // 2 + shiftY
+
+    def point(x, y):
+        # Koordinat relatif wajah (-0.5..0.5) ke piksel
+        return int(centerX + x * faceWidth), int(centerY + y * faceHeight)
+
+    def size(x, y):
+        return max(1, int(x * faceWidth)), max(1, int(y * faceHeight))
+
+    thickness = max(1, faceHeight // 60)
+
+    # Wajah dengan tekstur kulit (tekstur latar yang dicerahkan)
+    mask = np.zeros((height, width), np.uint8)
+    cv2.ellipse(mask, point(0, 0), size(0.5, 0.5), 0, 0, 360, 255, -1)
+    image[mask > 0] = np.clip(texture[mask > 0].astype(np.int16) + 90, 0, 255).astype(np.uint8)
+
+    for side in (-1, 1):
+        # Alis
+        browY = -0.2 - browRaise / faceHeight
+        cv2.line(image, point(side * 0.1, browY), point(side * 0.3, browY - 0.02), 40, thickness * 2)
+        # Mata dan pupil
+        cv2.ellipse(image, point(side * 0.2, -0.1), size(0.09, 0.04), 0, 0, 360, 230, -1)
+        cv2.ellipse(image, point(side * 0.2, -0.1), size(0.09, 0.04), 0, 0, 360, 30, thickness)
+        cv2.circle(image, point(side * 0.2, -0.1), max(1, int(0.03 * faceWidth)), 20, -1)
+
+    # Hidung
+    cv2.line(image, point(0, -0.05), point(-0.04, 0.1), 70, thickness)
+    cv2.line(image, point(-0.04, 0.1), point(0.04, 0.1), 70, thickness)
+
+    # Mulut: lebar dan lengkungan mengikuti smile
+    cv2.ellipse(image, point(0, 0.22), size(0.14 + 0.04 * smile, 0.03 + 0.04 * smile), 0, 0, 180, 50, thickness * 2)
+
+    return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+
+def write_synthetic_clip(path, frameCount, width, height, fps=30, seed=0):
+    """
+    Menulis video MJPG (.avi) berisi frameCount frame. Mengembalikan metadata
+    clip beserta kotak wajah pada posisi diam.
+    """
+    rng = np.random.default_rng(seed)
+    # Tekstur halus agar setiap blok POC punya detail untuk dicocokkan
+    texture = cv2.GaussianBlur(rng.integers(0, 120, (height, width), dtype=np.uint8), (0, 0), 1.5)
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"Failed to open video writer for {path}")
+    try:
+        for index in range(frameCount):
+            writer.write(draw_face_frame(width, height, index, fps, texture))
+    finally:
+        writer.release()
+
+    return {
+        "path": path,
+        "frames": frameCount,
+        "width": width,
+        "height": height,
+        "fps": fps,
+        "seed": seed,
+        "face_rectangle": get_face_rectangle(width, height),
+    }
@@ -19,3 +19,66 @@ class Config:
     UPLOAD_FOLDER_DATA = "data"
     MAX_VIDEO_CONTENT_LENGTH = 10 * 1024 * 1024
     WTF_CSRF_ENABLED=False
+
+    # Sampling frame video: stride eksplisit, atau target fps (None = semua frame),
+    # dan jumlah frame maksimum per video (0 = tanpa batas)
+    FRAME_SAMPLING_TARGET_FPS = float(os.environ['FRAME_SAMPLING_TARGET_FPS']) if os.environ.get('FRAME_SAMPLING_TARGET_FPS') else None
+    FRAME_SAMPLING_STRIDE = int(os.environ['FRAME_SAMPLING_STRIDE']) if os.environ.get('FRAME_SAMPLING_STRIDE') else None
+    FRAME_SAMPLING_MAX_FRAMES = int(os.environ.get('FRAME_SAMPLING_MAX_FRAMES', 200)) or None
+
+    # Deteksi wajah: 'full' (default) mendeteksi di seluruh frame setiap kali dan memproses semua wajah;
+    # 'tracking' (opsional, lebih cepat) menjalankan detector seluruh frame setiap FACE_DETECTION_INTERVAL
+    # frame dan di antaranya hanya di ROI sekitar landmark terakhir, dan hanya mengikuti wajah terbesar
+    FACE_DETECTION_MODE = os.environ.get('FACE_DETECTION_MODE', 'full')
+    FACE_DETECTION_INTERVAL = int(os.environ.get('FACE_DETECTION_INTERVAL', 10))
+    FACE_TRACKING_MARGIN = float(os.environ.get('FACE_TRACKING_MARGIN', 0.5))
+    # Skala gambar untuk detector HOG (landmark tetap dari resolusi penuh) dan jumlah upsample dlib
+    FACE_DETECTION_SCALE = float(os.environ.get('FACE_DETECTION_SCALE', 1.0))
+    FACE_DETECTION_UPSAMPLE = int(os.environ.get('FACE_DETECTION_UPSAMPLE', 0))
+
+    # Ekstraksi fitur paralel: jumlah worker process (1 = berurutan di thread request) dan jumlah frame per chunk
+    FEATURE_EXTRACTION_WORKERS = int(os.environ.get('FEATURE_EXTRACTION_WORKERS', 1))
+    FEATURE_EXTRACTION_CHUNK_SIZE = int(os.environ.get('FEATURE_EXTRACTION_CHUNK_SIZE', 16))
+
+    # Job analisis asynchronous: jumlah thread worker dan file SQLite (di dalam UPLOAD_FOLDER)
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+    JOB_DATABASE = os.environ.get('JOB_DATABASE', 'jobs.sqlite3')
+    # Job queued/running tanpa heartbeat selama ini (detik) dianggap mati saat server start
+    JOB_STALE_TIMEOUT = int(os.environ.get('JOB_STALE_TIMEOUT', 60 * 60))
+
+    # Prediksi: jumlah thread untuk menjalankan model-model SVM bersamaan (1 = berurutan),
+    # default sebanyak jumlah model tapi tidak lebih dari jumlah core
+    PREDICTION_WORKERS = int(os.environ.get('PREDICTION_WORKERS', min(4, os.cpu_count() or 1)))
+
+    # Streaming webcam: jumlah sesi aktif, batas idle (detik), frame maksimum per request
+    # (frame yang lebih lama dibuang agar latensi tetap terbatas) dan ukuran window prediksi bergulir
+    STREAM_MAX_SESSIONS = int(os.environ.get('STREAM_MAX_SESSIONS', 8))
+    STREAM_IDLE_TIMEOUT = int(os.environ.get('STREAM_IDLE_TIMEOUT', 60))
+    STREAM_MAX_FRAMES_PER_REQUEST = int(os.environ.get('STREAM_MAX_FRAMES_PER_REQUEST', 10))
+    STREAM_WINDOW_SIZE = int(os.environ.get('STREAM_WINDOW_SIZE', 30))
+
+    # Renderer gambar quiver untuk preview: 'opencv' (cepat, aman untuk thread) atau 'matplotlib'
+    # beserta faktor perbesaran ROI pada renderer opencv
+    PREVIEW_RENDERER = os.environ.get('PREVIEW_RENDERER', 'opencv')
+    PREVIEW_QUIVER_SCALE = int(os.environ.get('PREVIEW_QUIVER_SCALE', 6))
+
+    # Cache hasil berdasarkan isi video + konfigurasi pipeline (folder di dalam UPLOAD_FOLDER),
+    # dengan batas total ukuran (byte) semua output analisis di assets (video, fitur, preview; termasuk
+    # yang tidak ada di cache), umur entry/output (detik) dan interval eviction di background (detik)
+    RESULT_CACHE_ENABLED = os.environ.get('RESULT_CACHE_ENABLED', 'true').lower() == 'true'
+    RESULT_CACHE_FOLDER = os.environ.get('RESULT_CACHE_FOLDER', 'cache')
+    RESULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 1024 * 1024 * 1024))
+    RESULT_CACHE_MAX_AGE = int(os.environ.get('RESULT_CACHE_MAX_AGE', 7 * 24 * 60 * 60))
+    RESULT_CACHE_EVICT_INTERVAL = int(os.environ.get('RESULT_CACHE_EVICT_INTERVAL', 10 * 60))
+
+    # Model registry: mmap_mode joblib ('r', kosong = tanpa memory-map), interval cek perubahan file (detik)
+    # Dengan memory-map, ganti file model lewat rename atomik (mv / os.replace), jangan ditimpa di tempat
+    # dan opsi memuat semua model saat start (default: dimuat saat pertama dipakai)
+    MODEL_MMAP_MODE = os.environ.get('MODEL_MMAP_MODE', 'r') or None
+    MODEL_RELOAD_CHECK_INTERVAL = float(os.environ.get('MODEL_RELOAD_CHECK_INTERVAL', 2))
+    MODEL_PRELOAD = os.environ.get('MODEL_PRELOAD', 'false').lower() == 'true'
+
+    # Prediksi SVM RBF: 'numpy' menghitung kernel seluruh batch dengan operasi matriks (diaktifkan per
+    # model hanya jika hasilnya sama dengan model.predict saat dimuat), 'sklearn' memakai model.predict
+    SVM_SCORING_ENGINE = os.environ.get('SVM_SCORING_ENGINE', 'numpy')
+    SVM_SCORING_DTYPE = os.environ.get('SVM_SCORING_DTYPE', 'float64')
@@ -0,0 +1,70 @@
+"""
+Konfigurasi server produksi (prefork).
+
+    gunicorn app:app            (dijalankan dari services/backend, file ini dibaca otomatis)
+
+Aplikasi dan semua model (SVM, scaler, PCA, shape predictor dlib) dimuat sekali di
+master (preload_app + MODEL_REGISTRY.loadAll()), lalu objek Python yang sudah ada
+dibekukan dengan gc.freeze() sebelum fork. Worker berbagi page model tersebut secara
+copy-on-write, dan garbage collector tidak menyentuh (menyalin) page itu lagi.
+
+Thread OpenMP/BLAS per worker dibatasi WORKER_NATIVE_THREADS (default: jumlah core
+dibagi jumlah worker) agar NumPy/SciPy di beberapa worker tidak berebut core.
+Memori (RSS/PSS) per worker dicatat di log dan bisa dilihat di GET /server/workers.
+
+Default satu worker (WEB_CONCURRENCY=1), request paralel dilayani thread. State
+berikut hanya ada di memori proses yang membuatnya:
+    - job (JOB_EXECUTOR, event progress JOB_EVENTS) dan subscriber SSE-nya
+    - sesi streaming (StreamController)
+Request lanjutan (GET /jobs/<id>/events, chunk stream berikutnya) harus sampai di
+worker yang sama. Dengan WEB_CONCURRENCY > 1, load balancer di depan gunicorn wajib
+memakai sticky routing per job/sesi; gunicorn sendiri membagi koneksi ke worker
+mana saja.
+"""
+import gc
+import os
+
+bind = os.environ.get('BIND', f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+# Thread per worker untuk SSE progress, upload streaming dan thread pool job
+worker_class = 'gthread'
+threads = int(os.environ.get('WORKER_THREADS', 4))
+timeout = int(os.environ.get('WORKER_TIMEOUT', 300))
+preload_app = True
+
+# File ini dibaca sebelum aplikasi (dan numpy) di-import, jadi batas thread lewat environment
+# masih berlaku. Nilai yang sudah diset dari luar tidak ditimpa.
+native_threads = int(os.environ.get('WORKER_NATIVE_THREADS', max(1, (os.cpu_count() or 1) // workers)))
+for name in ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'BLIS_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS']:
+    os.environ.setdefault(name, str(native_threads))
+
+# Penanda untuk laporan memori worker (app/helper/server.py)
+os.environ['PREFORK_SERVER'] = 'gunicorn'
+
+def when_ready(server):
+    # Job dari proses server sebelumnya yang sudah mati ditandai gagal (sekali, di master)
+    from app.controller.JobController import recover_jobs
+    recover_jobs()
+
+    # Master: muat semua model sekarang (bukan saat request pertama di tiap worker)
+    from app.controller.DataModelController import MODEL_REGISTRY
+    MODEL_REGISTRY.loadAll()
+    report = MODEL_REGISTRY.report()
+    server.log.info(
+        "Preloaded %d model artifacts in %.2fs (%d bytes in memory, %d bytes memory-mapped)",
+        report['loaded'], report['total_load_time_seconds'], report['total_memory_bytes'], report['total_mmap_bytes']
+    )
+
+    # Objek yang sudah ada dipindah ke generasi permanen sebelum fork
+    gc.collect()
+    gc.freeze()
+
+def post_fork(server, worker):
+    from app.helper.server import limit_native_threads, get_process_memory
+    limit_native_threads(native_threads)
+
+    memory = get_process_memory() or {}
+    server.log.info(
+        "Worker %s started: %s native threads, rss %s bytes, pss %s bytes",
+        worker.pid, native_threads, memory.get('rss'), memory.get('pss')
+    )